@@ -9,10 +9,27 @@ import urllib.parse
 import urllib.error
 import socket
 import time
-import xml.etree.ElementTree as ET
-from datetime import datetime, timedelta
 import logging
 import os
+import copy
+import random
+import functools
+import threading
+from datetime import datetime, timezone
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Prefer lxml's C parser; fall back to the standard library if it is not installed
+try:
+    from lxml import etree as ET
+    HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAVE_LXML = False
 
 # Import configuration
 import config
@@ -25,6 +42,327 @@ class AviationWeatherAPIError(Exception):
     """Custom exception for API errors."""
     pass
 
+# Extra iterparse() options understood only by lxml; the API schema has no ID
+# attributes, so skip lxml's ID bookkeeping
+_ITERPARSE_OPTIONS = {'huge_tree': True, 'collect_ids': False} if HAVE_LXML else {}
+
+def _xml_parser():
+    """
+    Create an XML parser for API responses.
+    
+    Malformed or truncated payloads raise ET.ParseError rather than being
+    recovered into a partial tree that would pass for valid data.
+    
+    Returns:
+        XMLParser: lxml parser that accepts large payloads, or a standard
+        library parser when lxml is unavailable
+    """
+    if HAVE_LXML:
+        return ET.XMLParser(huge_tree=True, collect_ids=False)
+    return ET.XMLParser()
+
+def _missing_root_error(message="No XML root element found"):
+    """
+    Build the ParseError raised when a payload yields no usable XML root element.
+    
+    Args:
+        message (str): Error message
+        
+    Returns:
+        ET.ParseError: Error instance (lxml's ParseError also needs code/line/column)
+    """
+    if HAVE_LXML:
+        return ET.ParseError(message, 0, 0, 0)
+    return ET.ParseError(message)
+
+def _parse_xml(xml_bytes):
+    """
+    Parse an XML document from bytes.
+    
+    Args:
+        xml_bytes (bytes): Raw XML document
+        
+    Returns:
+        ET.Element: XML root element
+        
+    Raises:
+        ET.ParseError: If the document cannot be parsed or is not an API
+            <response> (e.g. an HTML error page)
+    """
+    root = ET.fromstring(xml_bytes, _xml_parser())
+    if root.tag != 'response':
+        raise _missing_root_error(f"Unexpected root element <{root.tag}>")
+    return root
+
+def _iterparse_tag(source, tag):
+    """
+    Stream the elements with a given tag out of an XML document.
+    
+    Elements are yielded as soon as their closing tag is parsed and detached
+    from the document once the caller moves on, so the partially built tree
+    never holds more than the report currently being handled. Callers may keep
+    references to the yielded elements.
+    
+    Args:
+        source: XML document as bytes, a file name or a binary file object
+        tag (str): Element tag to yield (e.g. METAR/TAF)
+        
+    Yields:
+        ET.Element: Each matching element, in document order
+        
+    Raises:
+        ET.ParseError: If the document contains no XML
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    
+    if HAVE_LXML:
+        # lxml filters on the tag in C, so other elements never reach Python
+        context = ET.iterparse(source, events=('end',), tag=tag, **_ITERPARSE_OPTIONS)
+        for _event, elem in context:
+            parent = elem.getparent()
+            yield elem
+            # The caller may have moved the element elsewhere; only detach it from the source
+            if parent is not None and elem.getparent() is parent:
+                parent.remove(elem)
+    else:
+        # Stdlib elements have no parent pointer, so track open elements from start events
+        context = ET.iterparse(source, events=('start', 'end'))
+        open_elems = []
+        for event, elem in context:
+            if event == 'start':
+                open_elems.append(elem)
+                continue
+            open_elems.pop()
+            if elem.tag == tag:
+                yield elem
+                if open_elems:
+                    open_elems[-1].remove(elem)
+    if context.root is None:
+        raise _missing_root_error()
+
+# Report lookups, compiled once at import time when lxml is available; reports are
+# direct children of <data>, so the paths avoid a descendant walk
+# Field lookups used by the merge return the stripped text, or '' when missing
+if HAVE_LXML:
+    _FIND_REPORTS = {tag: ET.XPath(f'data/{tag}') for tag in ('METAR', 'TAF')}
+    _STATION_ID_TEXT = ET.XPath('normalize-space(station_id)')
+    _REPORT_TIME_TEXT = {
+        'METAR': ET.XPath('normalize-space(observation_time)'),
+        'TAF': ET.XPath('normalize-space(issue_time | valid_time_from)'),
+    }
+else:
+    _FIND_REPORTS = {tag: functools.partial(ET.Element.findall, path=f'data/{tag}')
+                     for tag in ('METAR', 'TAF')}
+    
+    def _station_id_text(element):
+        return element.findtext('station_id', '').strip()
+    
+    def _metar_time_text(element):
+        return element.findtext('observation_time', '').strip()
+    
+    def _taf_time_text(element):
+        return (element.findtext('issue_time') or element.findtext('valid_time_from', '')).strip()
+    
+    _STATION_ID_TEXT = _station_id_text
+    _REPORT_TIME_TEXT = {'METAR': _metar_time_text, 'TAF': _taf_time_text}
+
+def count_metars(root):
+    """
+    Count the METAR reports in a parsed response.
+    
+    Args:
+        root (ET.Element): Response root element (<response><data>...)
+        
+    Returns:
+        int: Number of METAR elements in the response's data element
+    """
+    return len(_FIND_REPORTS['METAR'](root))
+
+def _sortable_time(timestamp):
+    """
+    Put a report timestamp in a form whose string order is chronological.
+    
+    API timestamps are already canonical ISO8601 UTC (YYYY-MM-DDTHH:MM:SSZ) and
+    are returned unchanged without being parsed; other ISO8601 forms (offsets,
+    fractional seconds) are converted to that form.
+    
+    Args:
+        timestamp (str): Timestamp text ('' when missing)
+        
+    Returns:
+        str: Canonical timestamp, or the input unchanged if it cannot be parsed
+    """
+    if not timestamp or (len(timestamp) == 20 and timestamp[-1] == 'Z'):
+        return timestamp
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except ValueError:
+        return timestamp
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def _collect_latest(payload, data_type, station_records):
+    """
+    Stream one response into station_records, keeping the newest report per station.
+    
+    Args:
+        payload (bytes): Raw XML response
+        data_type (str): Type of data (METAR/TAF)
+        station_records (dict): station_id -> (observation_time, element), updated in place;
+            observation_time is None until the station has been seen twice
+        
+    Returns:
+        int: Number of reports found in the response
+        
+    Raises:
+        ET.ParseError: If the response cannot be parsed
+    """
+    report_time = _REPORT_TIME_TEXT[data_type]
+    record_count = 0
+    
+    for element in _iterparse_tag(payload, data_type):
+        record_count += 1
+        station_id = _STATION_ID_TEXT(element) or element.get('station_id', '').strip()
+        if not station_id:
+            continue
+        
+        existing = station_records.get(station_id)
+        if existing is None:
+            # First report for this station: keep it; its time is only read if a duplicate shows up
+            station_records[station_id] = (None, element)
+            continue
+        
+        # Canonical ISO8601 timestamps (YYYY-MM-DDTHH:MM:SSZ) order correctly as plain strings.
+        # Keep the most recent observation per station; a record without
+        # a timestamp ('') never replaces one that has been seen already
+        kept_time, kept = existing
+        if kept_time is None:
+            kept_time = _sortable_time(report_time(kept))
+        obs_time = _sortable_time(report_time(element))
+        if obs_time > kept_time:
+            station_records[station_id] = (obs_time, element)
+        else:
+            station_records[station_id] = (kept_time, kept)
+    
+    return record_count
+
+# Placeholder entries in the airports file that are not real stations
+_SKIP_CODES = frozenset(('NULL', 'LGND'))
+
+def _normalize_codes(airport_codes):
+    """
+    Normalize airport codes into unique station IDs in one pass.
+    
+    Args:
+        airport_codes (iterable): Airport ICAO codes
+        
+    Returns:
+        list: Uppercased, stripped station IDs in first-seen order, without blanks
+        or NULL/LGND placeholders
+    """
+    # A dict dedupes while keeping insertion order
+    seen = {}
+    for code in airport_codes:
+        station = code.strip().upper()
+        if station and station not in _SKIP_CODES:
+            seen[station] = None
+    return list(seen)
+
+@functools.lru_cache(maxsize=4)
+def _prepare_stations(airport_codes):
+    """
+    Normalize airport codes into unique station IDs and their joined id string.
+    
+    Cached because the same airport list is requested on every polling cycle.
+    
+    Args:
+        airport_codes (tuple): Airport ICAO codes, possibly including NULL/LGND placeholders
+        
+    Returns:
+        tuple: (stations, airport_string) - sorted, normalized station IDs
+        and the comma-separated string used in request URLs
+    """
+    # Sorting makes the request URL identical for the same station set, whatever the input order,
+    # so repeat polls can be answered from the API's edge cache.
+    stations = tuple(sorted(_normalize_codes(airport_codes)))
+    
+    return stations, ','.join(stations)
+
+@functools.lru_cache(maxsize=4)
+def _batch_id_strings(stations, max_per_request):
+    """
+    Split stations into request batches and join each batch's id string.
+    
+    Cached so the METAR and TAF requests of one polling cycle share the same strings.
+    
+    Args:
+        stations (tuple): Normalized station IDs
+        max_per_request (int): Maximum number of stations per batch
+        
+    Returns:
+        tuple: Comma-separated station id string for each batch
+    """
+    return tuple(','.join(stations[i:i + max_per_request])
+                 for i in range(0, len(stations), max_per_request))
+
+# Empty response document, parsed once and copied for every error/empty path
+_EMPTY_RESPONSE = _parse_xml(b'<response><data num_results="0"/></response>')
+
+class _DeadlineRetry(Retry):
+    """
+    urllib3 Retry that bounds the total time one request spends retrying.
+    
+    The clock starts at the first failed attempt. Backoff is jittered so
+    clients that fail together do not retry in lockstep. Backoff and
+    Retry-After sleeps are clipped to the time left in the budget, and once the
+    budget is spent the retries count as exhausted, so one slow batch cannot
+    hold a worker for the full exponential backoff.
+    """
+    
+    def __init__(self, *args, budget=None, started=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.budget = budget
+        self.started = started
+    
+    def new(self, **kw):
+        # increment() builds a new Retry per failed attempt; carry the deadline over
+        kw.setdefault('budget', self.budget)
+        kw.setdefault('started', time.monotonic() if self.started is None else self.started)
+        return super().new(**kw)
+    
+    def _remaining(self):
+        """
+        Seconds left in the retry budget.
+        
+        Returns:
+            float: Remaining seconds, or None if there is no budget or clock yet
+        """
+        if self.budget is None or self.started is None:
+            return None
+        return self.budget - (time.monotonic() - self.started)
+    
+    def is_exhausted(self):
+        remaining = self._remaining()
+        if remaining is not None and remaining <= 0:
+            return True
+        return super().is_exhausted()
+    
+    def get_backoff_time(self):
+        # urllib3 does not wait before the first retry; always wait at least backoff_factor,
+        # up to a random point below the exponential backoff
+        backoff = random.uniform(self.backoff_factor, max(super().get_backoff_time(), self.backoff_factor))
+        remaining = self._remaining()
+        return backoff if remaining is None else max(0, min(backoff, remaining))
+    
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        remaining = self._remaining()
+        if retry_after is None or remaining is None:
+            return retry_after
+        return max(0, min(retry_after, remaining))
+
 class AviationWeatherAPIClient:
     """Client for AviationWeather.gov 2025 API."""
     
@@ -32,7 +370,14 @@ class AviationWeatherAPIClient:
     MAX_PER_REQUEST = 380  # Safe below API cap
     REQUEST_TIMEOUT = 15
     RETRIES = 3
-    INTER_BATCH_SLEEP = 0.2
+    MAX_CONCURRENT_BATCHES = 4  # Caps in-flight batch requests
+    METAR_CACHE_TTL = 60  # METARs update roughly every 5 minutes
+    TAF_CACHE_TTL = 600  # TAFs update roughly hourly
+    CACHE_MAX_ENTRIES = 8  # A map polls one station list, so a few entries cover METAR and TAF
+    
+    # Fixed instance layout: no per-instance __dict__, and attribute access is a slot lookup
+    __slots__ = ('base_url', 'timeout', 'retry_attempts', 'retry_delay', 'handle_errors',
+                 'default_to_nowx', '_metar_tpl', '_taf_tpl', '_cache', '_cache_lock', '_session')
     
     def __init__(self):
         """Initialize the API client with configuration."""
@@ -43,6 +388,31 @@ class AviationWeatherAPIClient:
         self.handle_errors = getattr(config, 'handle_api_errors', 1)
         self.default_to_nowx = getattr(config, 'default_to_nowx_on_error', 1)
         
+        # Request URL templates, built once; only the hours value varies per call
+        self._metar_tpl = f"{self.base_url}/metar?format=xml&hours={{hours}}&ids="
+        self._taf_tpl = f"{self.base_url}/taf?format=xml&hours={{hours}}&ids="
+        
+        # Recent results keyed by (stations, hours, data type) -> (expires_at, root)
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        
+        # Shared keep-alive session so METAR, TAF and every batch reuse pooled connections
+        self._session = requests.Session()
+        # Transient failures are retried by urllib3 with jittered exponential backoff, honoring Retry-After on 429/503.
+        # raise_on_status=False hands the last error response back so its status code is still reported.
+        # Retrying one request stops once timeout * retry_attempts seconds have gone by.
+        retries = _DeadlineRetry(
+            total=self.retry_attempts - 1,  # retry_attempts counts the first try
+            budget=self.timeout * self.retry_attempts,
+            backoff_factor=self.retry_delay,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        self._session.mount('https://', HTTPAdapter(max_retries=retries, pool_connections=4, pool_maxsize=20))
+        self._session.headers.update({'User-Agent': 'LiveSectional/1.0', 'Accept-Encoding': 'gzip, deflate'})
+        
     def get_metar_data(self, airport_codes, hours=2.5):
         """
         Fetch METAR data for specified airports.
@@ -57,8 +427,7 @@ class AviationWeatherAPIClient:
         Raises:
             AviationWeatherAPIError: If API request fails
         """
-        url = f"{self.base_url}/metar?format=xml&hours={hours}&ids="
-        return self._make_request(url, airport_codes, "METAR")
+        return self._cached_request(self._metar_tpl, airport_codes, hours, "METAR", self.METAR_CACHE_TTL)
     
     def get_taf_data(self, airport_codes, hours=2.5):
         """
@@ -74,39 +443,139 @@ class AviationWeatherAPIClient:
         Raises:
             AviationWeatherAPIError: If API request fails
         """
-        url = f"{self.base_url}/taf?format=xml&hours={hours}&ids="
-        return self._make_request(url, airport_codes, "TAF")
+        return self._cached_request(self._taf_tpl, airport_codes, hours, "TAF", self.TAF_CACHE_TTL)
     
-    def _make_request(self, base_url, airport_codes, data_type):
+    def _cached_request(self, url_template, airport_codes, hours, data_type, ttl):
         """
-        Make API request with retry logic and error handling.
+        Return a recent cached result for the same request, or fetch a new one.
+        
+        Every caller gets its own copy of the tree, so it may be modified freely.
+        Responses without any reports (empty or error fallbacks) are not cached.
         
         Args:
-            base_url (str): Base URL for the API endpoint
-            airport_codes (list): List of airport codes
+            url_template (str): Request URL template with an {hours} field
+            airport_codes (list): List of airport ICAO codes
+            hours (float): Number of hours of data to retrieve
             data_type (str): Type of data being requested (METAR/TAF)
+            ttl (float): Seconds a cached result stays fresh
             
         Returns:
             ET.Element: XML root element
             
         Raises:
-            AviationWeatherAPIError: If all retry attempts fail
+            AviationWeatherAPIError: If API request fails
         """
-        # Filter out NULL and LGND entries
-        valid_codes = [code for code in airport_codes if code not in ['NULL', 'LGND']]
+        airport_codes = tuple(airport_codes)
+        stations, _ = _prepare_stations(airport_codes)
+        # Stations are sorted, so the same stations in a different order share a key
+        key = (stations, hours, data_type)
+        
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+        if entry is not None and now < entry[0]:
+            return copy.deepcopy(entry[1])
+        
+        root = self._make_request(url_template.format(hours=hours), airport_codes, data_type)
+        if not _FIND_REPORTS[data_type](root):
+            return root
         
-        if not valid_codes:
-            logger.warning("No valid airport codes provided")
-            return self._create_empty_response(data_type)
+        with self._cache_lock:
+            # Drop expired entries, then the oldest ones while the cache is still full
+            for stale in [k for k, (expires_at, _) in self._cache.items() if expires_at <= now]:
+                del self._cache[stale]
+            self._cache.pop(key, None)
+            while len(self._cache) >= self.CACHE_MAX_ENTRIES:
+                del self._cache[next(iter(self._cache))]
+            self._cache[key] = (now + ttl, copy.deepcopy(root))
+        return root
+    
+    def get_weather(self, airport_codes, hours=2.5):
+        """
+        Fetch METAR and TAF data for specified airports concurrently.
         
-        # Normalize station IDs (uppercase, stripped, unique)
-        stations = []
-        for code in valid_codes:
-            stations.append(code.strip().upper())
-        stations = list(dict.fromkeys([s for s in stations if s]))  # preserves order, unique
+        Both requests share the client's connection pool, so the combined poll
+        takes roughly as long as the slower of the two.
+        
+        Args:
+            airport_codes (list): List of airport ICAO codes
+            hours (float): Number of hours of data to retrieve
+            
+        Returns:
+            tuple: (metar_root, taf_root) XML root elements
+            
+        Raises:
+            AviationWeatherAPIError: If either API request fails
+        """
+        airport_codes = tuple(airport_codes)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            metar = executor.submit(self.get_metar_data, airport_codes, hours)
+            taf = executor.submit(self.get_taf_data, airport_codes, hours)
+            return metar.result(), taf.result()
+    
+    def get_metar_data_iter(self, airport_codes, hours=2.5):
+        """
+        Stream METAR reports for specified airports one element at a time.
+        
+        Unlike get_metar_data, no merged tree is built: each batch response is
+        scanned once and every report is released after the caller has seen it.
+        Batches that fail after retries are skipped rather than raising.
+        
+        Args:
+            airport_codes (list): List of airport ICAO codes
+            hours (float): Number of hours of data to retrieve
+            
+        Yields:
+            ET.Element: METAR element (cleared once the caller moves on)
+        """
+        stations, _ = _prepare_stations(tuple(airport_codes))
+        base_url = self._metar_tpl.format(hours=hours)
+        
+        for batch_idx, ids in enumerate(_batch_id_strings(stations, self.MAX_PER_REQUEST)):
+            content = self._fetch_batch(batch_idx, base_url + ids, "METAR")
+            if content is not None:
+                yield from self.iter_reports("METAR", content)
+    
+    def iter_reports(self, data_type, payload):
+        """
+        Iterate over the METAR/TAF reports in a response without building a full tree.
+        
+        Args:
+            data_type (str): Report tag to yield (METAR/TAF)
+            payload (bytes): XML response content
+            
+        Yields:
+            ET.Element: Report element; it is cleared after the caller resumes
+            
+        Raises:
+            ET.ParseError: If the payload cannot be parsed
+        """
+        for elem in _iterparse_tag(payload, data_type):
+            yield elem
+            if HAVE_LXML:
+                elem.clear(keep_tail=True)
+            else:
+                elem.clear()
+    
+    def _make_request(self, base_url, airport_codes, data_type):
+        """
+        Make API request with error handling.
+        
+        Args:
+            base_url (str): Base URL for the API endpoint
+            airport_codes (tuple): Airport codes (a tuple so station prep can be cached)
+            data_type (str): Type of data being requested (METAR/TAF)
+            
+        Returns:
+            ET.Element: XML root element
+            
+        Raises:
+            AviationWeatherAPIError: If the request still fails after the adapter's retries
+        """
+        stations, airport_string = _prepare_stations(airport_codes)
         
         if not stations:
-            logger.warning("No valid stations after normalization")
+            logger.warning("No valid airport codes provided")
             return self._create_empty_response(data_type)
         
         # Handle chunking for requests with > MAX_PER_REQUEST airports
@@ -114,46 +583,32 @@ class AviationWeatherAPIClient:
             return self._make_chunked_request(base_url, stations, data_type)
         
         # Build URL with airport codes
-        airport_string = ','.join(stations)
         url = base_url + airport_string
         
         if loglevel <= 2:  # Only log if info level is enabled
-            logger.info(f"Requesting {data_type} data for {len(stations)} airports")
+            logger.info("Requesting %s data for %d airports", data_type, len(stations))
         if loglevel <= 1:  # Only log if debug level is enabled
-            logger.debug(f"API URL: {url}")
+            logger.debug("API URL: %s", url)
         
-        # Make request with retry logic
-        for attempt in range(self.retry_attempts):
-            try:
-                response = self._make_single_request(url)
-                return self._parse_response(response, data_type)
-                
-            except urllib.error.HTTPError as e:
-                error_msg = self._handle_http_error(e.code, data_type)
-                if e.code in [400, 204] and self.handle_errors:
-                    logger.warning(f"HTTP {e.code}: {error_msg}")
-                    return self._create_empty_response(data_type)
-                elif attempt < self.retry_attempts - 1:
-                    logger.warning(f"HTTP {e.code} on attempt {attempt + 1}, retrying...")
-                    time.sleep(self.retry_delay * (attempt + 1))
-                else:
-                    raise AviationWeatherAPIError(f"HTTP {e.code}: {error_msg}")
-                    
-            except (urllib.error.URLError, socket.timeout) as e:
-                if attempt < self.retry_attempts - 1:
-                    logger.warning(f"Network error on attempt {attempt + 1}: {e}, retrying...")
-                    time.sleep(self.retry_delay * (attempt + 1))
-                else:
-                    raise AviationWeatherAPIError(f"Network error: {e}")
-                    
-            except Exception as e:
-                logger.error(f"Unexpected error on attempt {attempt + 1}: {e}")
-                if attempt < self.retry_attempts - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
-                else:
-                    raise AviationWeatherAPIError(f"Unexpected error: {e}")
-        
-        raise AviationWeatherAPIError("All retry attempts failed")
+        # Retries with backoff happen inside the session's HTTP adapter
+        try:
+            response = self._make_single_request(url)
+            
+        except urllib.error.HTTPError as e:
+            error_msg = self._handle_http_error(e.code, data_type)
+            if e.code in [400, 204] and self.handle_errors:
+                logger.warning("HTTP %d: %s", e.code, error_msg)
+                return self._create_empty_response(data_type)
+            raise AviationWeatherAPIError(f"HTTP {e.code}: {error_msg}")
+            
+        except (urllib.error.URLError, socket.timeout) as e:
+            raise AviationWeatherAPIError(f"Network error: {e}")
+            
+        except Exception as e:
+            logger.error("Unexpected error: %s", e)
+            raise AviationWeatherAPIError(f"Unexpected error: {e}")
+        
+        return self._parse_response(response, data_type)
     
     def _make_chunked_request(self, base_url, airport_codes, data_type):
         """
@@ -161,108 +616,101 @@ class AviationWeatherAPIClient:
         
         Args:
             base_url (str): Base URL for the API endpoint
-            airport_codes (list): List of airport codes
+            airport_codes (tuple): Station IDs, already normalized by _prepare_stations
             data_type (str): Type of data being requested
             
         Returns:
             ET.Element: Combined XML root element
         """
-        # Normalize station IDs (uppercase, stripped, unique)
-        stations = list(set([code.strip().upper() for code in airport_codes if code and code.strip()]))
+        stations = tuple(airport_codes)
         
         if not stations:
             logger.warning("No valid stations after normalization")
             return self._create_empty_response(data_type)
         
         # Split into chunks of size <= MAX_PER_REQUEST
-        chunks = []
-        for i in range(0, len(stations), self.MAX_PER_REQUEST):
-            chunks.append(stations[i:i + self.MAX_PER_REQUEST])
+        chunks = _batch_id_strings(stations, self.MAX_PER_REQUEST)
         
         # Debug logging when PILOTMAP_DEBUG_BATCH=1
         if os.getenv('PILOTMAP_DEBUG_BATCH') == '1':
-            logger.info(f"Batching {len(stations)} stations into {len(chunks)} batches of max {self.MAX_PER_REQUEST}")
-        
-        all_xml_content = []
-        
-        for batch_idx, chunk in enumerate(chunks):
-            airport_string = ','.join(chunk)
-            url = base_url + airport_string
-            
-            # Make request with retry logic and exponential backoff
-            for attempt in range(self.retry_attempts):
-                try:
-                    response = self._make_single_request(url)
-                    
-                    # Handle different response types
-                    if response:
-                        content = self._extract_xml_content(response)
-                        all_xml_content.append(content)
-                        
-                        if os.getenv('PILOTMAP_DEBUG_BATCH') == '1':
-                            # Count records in this batch
-                            try:
-                                batch_xml = '\n'.join(['<x>'] + content + ['</x>'])
-                                batch_root = ET.fromstring(batch_xml)
-                                record_count = len(batch_root.findall('.//METAR')) if data_type == 'METAR' else len(batch_root.findall('.//TAF'))
-                                logger.info(f"Batch {batch_idx + 1}: {record_count} records returned")
-                            except:
-                                pass
-                        
-                        break  # Success, exit retry loop
-                    
-                except urllib.error.HTTPError as e:
-                    if e.code == 204:  # No content
-                        if os.getenv('PILOTMAP_DEBUG_BATCH') == '1':
-                            logger.info(f"Batch {batch_idx + 1}: No content (204)")
-                        break  # Continue to next batch
-                    elif e.code in [400, 429, 500, 502, 503, 504]:
-                        if attempt < self.retry_attempts - 1:
-                            backoff_delay = self.retry_delay * (2 ** attempt)
-                            logger.warning(f"Batch {batch_idx + 1} attempt {attempt + 1} failed with HTTP {e.code}, retrying in {backoff_delay}s...")
-                            time.sleep(backoff_delay)
-                        else:
-                            logger.warning(f"Batch {batch_idx + 1} failed after {self.retry_attempts} attempts with HTTP {e.code}")
-                            break  # Continue to next batch
-                    else:
-                        logger.warning(f"Batch {batch_idx + 1} failed with HTTP {e.code}")
-                        break  # Continue to next batch
-                        
-                except (urllib.error.URLError, socket.timeout) as e:
-                    if attempt < self.retry_attempts - 1:
-                        backoff_delay = self.retry_delay * (2 ** attempt)
-                        logger.warning(f"Batch {batch_idx + 1} attempt {attempt + 1} network error: {e}, retrying in {backoff_delay}s...")
-                        time.sleep(backoff_delay)
-                    else:
-                        logger.warning(f"Batch {batch_idx + 1} failed after {self.retry_attempts} attempts with network error: {e}")
-                        break  # Continue to next batch
-                        
-                except Exception as e:
-                    logger.warning(f"Batch {batch_idx + 1} unexpected error: {e}")
-                    break  # Continue to next batch
-            
-            # Inter-batch sleep to avoid rate limiting
-            if batch_idx < len(chunks) - 1:  # Don't sleep after last batch
-                time.sleep(self.INTER_BATCH_SLEEP)
-        
-        # Merge and deduplicate by observation_time
-        return self._merge_and_deduplicate_xml(all_xml_content, data_type)
+            logger.info("Batching %d stations into %d batches of max %d", len(stations), len(chunks), self.MAX_PER_REQUEST)
+        
+        # Batches are independent, so fetch them concurrently over the shared connection pool
+        # (the worker count caps in-flight requests)
+        fetch_batch = self._fetch_batch  # bind once rather than per batch
+        with ThreadPoolExecutor(max_workers=min(self.MAX_CONCURRENT_BATCHES, len(chunks))) as executor:
+            submit = executor.submit
+            futures = [submit(fetch_batch, batch_idx, base_url + ids, data_type)
+                       for batch_idx, ids in enumerate(chunks)]
+            
+            # Hand each batch to the merge as soon as it arrives, so parsing overlaps the
+            # downloads still in flight; batch order is kept so merging is deterministic
+            responses = (content for content in (f.result() for f in futures) if content is not None)
+            
+            # Merge and deduplicate by observation_time
+            return self._merge_and_deduplicate_xml(responses, data_type, len(futures))
+    
+    def _fetch_batch(self, batch_idx, url, data_type):
+        """
+        Fetch one batch of a chunked request.
+        
+        Retries are handled by the session's HTTP adapter; a batch that still
+        fails is logged and skipped.
+        
+        Args:
+            batch_idx (int): Zero-based batch index (used for logging)
+            url (str): Complete URL for this batch
+            data_type (str): Type of data being requested
+            
+        Returns:
+            bytes: Raw XML response, or None if the batch failed
+        """
+        try:
+            response = self._make_single_request(url)
+            
+        except urllib.error.HTTPError as e:
+            if e.code == 204:  # No content
+                if os.getenv('PILOTMAP_DEBUG_BATCH') == '1':
+                    logger.info("Batch %d: No content (204)", batch_idx + 1)
+            else:
+                logger.warning("Batch %d failed with HTTP %d", batch_idx + 1, e.code)
+            return None
+            
+        except (urllib.error.URLError, socket.timeout) as e:
+            logger.warning("Batch %d failed with network error: %s", batch_idx + 1, e)
+            return None
+            
+        except Exception as e:
+            logger.warning("Batch %d unexpected error: %s", batch_idx + 1, e)
+            return None
+        
+        return response or None
     
     def _make_single_request(self, url):
         """
-        Make a single HTTP request.
+        Make a single HTTP request over the pooled connection.
         
         Args:
             url (str): Complete URL to request
             
         Returns:
             bytes: Response content
+            
+        Raises:
+            urllib.error.HTTPError: If the server returns an error status
+            urllib.error.URLError: If the connection fails or times out
         """
-        request = urllib.request.Request(url)
-        request.add_header('User-Agent', 'LiveSectional/1.0')
+        try:
+            # XML compresses well; requests transparently decompresses the body
+            response = self._session.get(url, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            # Report transport failures as URLError so the retry handling stays the same
+            raise urllib.error.URLError(e)
+        
+        if response.status_code >= 400:
+            raise urllib.error.HTTPError(url, response.status_code, response.reason, response.headers, None)
         
-        with urllib.request.urlopen(request, timeout=self.timeout) as response:
-            return response.read()
+        return response.content
     
     def _parse_response(self, response_content, data_type):
         """
@@ -273,146 +721,70 @@ class AviationWeatherAPIClient:
             data_type (str): Type of data (METAR/TAF)
             
         Returns:
-            ET.Element: XML root element
+            ET.Element: <response> root element with the reports under <data>
         """
+        # Common for stations outside the reporting window: skip the parser entirely
+        if b'num_results="0"' in response_content[:1024]:
+            return self._create_empty_response(data_type)
+        
         try:
-            # Extract XML content using robust method
-            xml_lines = self._extract_xml_content(response_content)
-            logger.info(f"_parse_response: Extracted {len(xml_lines)} XML lines")
-            logger.info(f"_parse_response: First few lines: {xml_lines[:3] if len(xml_lines) >= 3 else xml_lines}")
-            
-            # Create complete XML document
-            if xml_lines and xml_lines[0].strip().startswith('<?xml'):
-                # Full XML response - parse directly
-                xml_str = '\n'.join(xml_lines)
-                logger.info(f"_parse_response: Parsing full XML response, length: {len(xml_str)}")
-            else:
-                # Partial XML - wrap with container
-                xml_content = ['<x>'] + xml_lines + ['</x>']
-                xml_str = '\n'.join(xml_content)
-                logger.info(f"_parse_response: Created wrapped XML string, length: {len(xml_str)}")
-            
-            # Parse XML
-            root = ET.fromstring(xml_str)
-            logger.info(f"_parse_response: Parsed XML successfully, root: {root.tag}")
+            # The API returns a complete <response><data>...</data></response> document
+            root = _parse_xml(response_content)
+            
             if loglevel <= 2:  # Only log if info level is enabled
-                logger.info(f"Successfully parsed {data_type} response")
+                logger.info("Successfully parsed %s response", data_type)
             return root
             
         except ET.ParseError as e:
-            logger.error(f"XML parsing error: {e}")
+            logger.error("XML parsing error: %s", e)
             raise AviationWeatherAPIError(f"Invalid XML response: {e}")
         except Exception as e:
-            logger.error(f"Response parsing error: {e}")
+            logger.error("Response parsing error: %s", e)
             raise AviationWeatherAPIError(f"Response parsing failed: {e}")
     
-    def _extract_xml_content(self, response_content):
-        """
-        Extract XML content from response.
-        
-        Args:
-            response_content (bytes): Raw response content
-            
-        Returns:
-            list: List of XML lines
-        """
-        content_str = response_content.decode('UTF-8')
-        lines = content_str.splitlines()
-        logger.info(f"_extract_xml_content: Response has {len(lines)} lines")
-        logger.info(f"_extract_xml_content: First 5 lines: {lines[:5]}")
-        logger.info(f"_extract_xml_content: Last 5 lines: {lines[-5:]}")
-        
-        start = next((i for i,l in enumerate(lines) if '<data' in l), 8)
-        end = next((i for i in range(len(lines)-1, -1, -1) if '</data>' in lines[i]), len(lines)-1)
-        
-        logger.info(f"_extract_xml_content: Found data start at line {start}, end at line {end}")
-        
-        result = lines[start:end+1] if start <= end else lines[8:len(lines)-1]
-        logger.info(f"_extract_xml_content: Extracted {len(result)} lines")
-        logger.info(f"_extract_xml_content: First few extracted lines: {result[:3] if len(result) >= 3 else result}")
-        
-        return result
-    
-    def _merge_and_deduplicate_xml(self, all_content, data_type):
+    def _merge_and_deduplicate_xml(self, all_content, data_type, chunk_count=None):
         """
         Merge and deduplicate XML responses by observation_time.
         
         Args:
-            all_content (list): List of XML content lines
+            all_content (iterable): Raw XML responses (bytes), one per batch; may be a
+                generator that yields responses as they are downloaded
             data_type (str): Type of data (METAR/TAF)
+            chunk_count (int): Number of responses expected, when all_content has no len()
             
         Returns:
             ET.Element: Combined XML root element with deduplicated records
         """
-        if not all_content:
+        debug_batch = os.getenv('PILOTMAP_DEBUG_BATCH') == '1'  # read once per merge
+        if chunk_count is None:
+            chunk_count = len(all_content)
+        
+        if not chunk_count:
             logger.warning("_merge_and_deduplicate_xml: No content provided")
             return self._create_empty_response(data_type)
         
-        logger.info(f"_merge_and_deduplicate_xml: Processing {len(all_content)} content chunks")
-        
-        # Parse all METAR/TAF elements from collected chunks
+        # Parse all METAR/TAF elements from collected chunks; per-batch record counts
+        # for debug logging come from the same streaming pass
         station_records = {}  # station_id -> (observation_time, element)
-        
-        for i, content in enumerate(all_content):
+        for batch_num, content in enumerate(all_content, 1):
             try:
-                logger.info(f"_merge_and_deduplicate_xml: Processing chunk {i+1}, content length: {len(content)}")
-                logger.info(f"_merge_and_deduplicate_xml: First few lines of chunk {i+1}: {content[:3] if len(content) >= 3 else content}")
-                
-                # Create temporary XML document for parsing
-                if content and content[0].strip().startswith('<?xml'):
-                    # Full XML response - parse directly
-                    temp_xml = '\n'.join(content)
-                    logger.info(f"_merge_and_deduplicate_xml: Parsing full XML for chunk {i+1}")
-                else:
-                    # Partial XML - wrap with container
-                    temp_xml = '\n'.join(['<x>'] + content + ['</x>'])
-                    logger.info(f"_merge_and_deduplicate_xml: Created wrapped XML for chunk {i+1}")
-                temp_root = ET.fromstring(temp_xml)
-                
-                # Find all METAR or TAF elements
-                elements = temp_root.findall('.//METAR') if data_type == 'METAR' else temp_root.findall('.//TAF')
-                logger.info(f"_merge_and_deduplicate_xml: Found {len(elements)} {data_type} elements in chunk {i+1}")
-                
-                for element in elements:
-                    sid_elem = element.find('station_id')
-                    station_id = (sid_elem.text.strip() if sid_elem is not None and sid_elem.text else element.get('station_id','').strip())
-                    if not station_id:
-                        continue
-                    
-                    # Get observation time for deduplication
-                    if data_type == 'TAF':
-                        time_elem = element.find('issue_time') or element.find('valid_time_from')
-                    else:  # METAR
-                        time_elem = element.find('observation_time')
-                    if time_elem is not None and time_elem.text:
-                        obs_time_str = time_elem.text.strip()
-                        try:
-                            # Parse ISO8601 timestamp for comparison
-                            obs_time = datetime.fromisoformat(obs_time_str.replace('Z', '+00:00'))
-                            
-                            # Keep the most recent observation per station
-                            if station_id not in station_records or obs_time > station_records[station_id][0]:
-                                station_records[station_id] = (obs_time, element)
-                        except ValueError:
-                            # If timestamp parsing fails, keep the record anyway
-                            if station_id not in station_records:
-                                station_records[station_id] = (datetime.min, element)
-                    else:
-                        # No observation time, keep if we don't have this station
-                        if station_id not in station_records:
-                            station_records[station_id] = (datetime.min, element)
-                            
+                record_count = _collect_latest(content, data_type, station_records)
             except ET.ParseError as e:
-                logger.warning(f"Failed to parse XML chunk: {e}")
+                logger.warning("Failed to parse XML chunk: %s", e)
                 continue
+            if debug_batch:
+                logger.info("Batch %d: %d records returned", batch_num, record_count)
+        
+        if debug_batch:
+            logger.info("Final result: %d unique stations after deduplication", len(station_records))
         
         # Reconstruct XML with deduplicated records
         if not station_records:
-            logger.warning(f"_merge_and_deduplicate_xml: No station records found after processing {len(all_content)} chunks")
+            logger.warning("_merge_and_deduplicate_xml: No station records found after processing %d chunks", chunk_count)
             return self._create_empty_response(data_type)
         
         # Create new XML structure
-        root = ET.Element('x')
+        root = ET.Element('response')
         data_elem = ET.SubElement(root, 'data')
         data_elem.set('num_results', str(len(station_records)))
         
@@ -420,11 +792,8 @@ class AviationWeatherAPIClient:
         for station_id, (obs_time, element) in station_records.items():
             data_elem.append(element)
         
-        if os.getenv('PILOTMAP_DEBUG_BATCH') == '1':
-            logger.info(f"Final result: {len(station_records)} unique stations after deduplication")
-        
         if loglevel <= 2:  # Only log if info level is enabled
-            logger.info(f"Successfully merged and deduplicated {data_type} responses")
+            logger.info("Merged %d %s responses into %d unique stations", chunk_count, data_type, len(station_records))
         
         return root
     
@@ -433,26 +802,31 @@ class AviationWeatherAPIClient:
         Combine multiple XML responses into one (legacy method for backward compatibility).
         
         Args:
-            all_content (list): List of XML content lines
+            all_content (list): List of raw XML responses (bytes), one per batch
             data_type (str): Type of data (METAR/TAF)
             
         Returns:
             ET.Element: Combined XML root element
         """
-        # Create combined XML document
-        xml_content = ['<x>'] + all_content + ['</x>']
-        xml_str = '\n'.join(xml_content)
+        root = ET.Element('response')
+        data_elem = ET.SubElement(root, 'data')
         
         try:
-            root = ET.fromstring(xml_str)
+            # Stream each response and move its reports straight into the combined document
+            for content in all_content:
+                for elem in _iterparse_tag(content, data_type):
+                    data_elem.append(elem)
+            data_elem.set('num_results', str(len(data_elem)))
             if loglevel <= 2:  # Only log if info level is enabled
-                logger.info(f"Successfully combined {data_type} responses")
+                logger.info("Successfully combined %s responses", data_type)
             return root
         except ET.ParseError as e:
-            logger.error(f"XML combination error: {e}")
+            logger.error("XML combination error: %s", e)
             raise AviationWeatherAPIError(f"Failed to combine XML responses: {e}")
     
-    def _handle_http_error(self, status_code, data_type):
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _handle_http_error(status_code, data_type):
         """
         Handle HTTP error codes.
         
@@ -484,12 +858,8 @@ class AviationWeatherAPIClient:
         Returns:
             ET.Element: Empty XML root element
         """
-        if data_type == "METAR":
-            xml_str = '<x><data num_results="0"></data></x>'
-        else:  # TAF
-            xml_str = '<x><data num_results="0"></data></x>'
-        
-        return ET.fromstring(xml_str)
+        # METAR and TAF share the same empty document; copy so callers may modify it
+        return copy.deepcopy(_EMPTY_RESPONSE)
     
     def test_connection(self):
         """
@@ -499,15 +869,17 @@ class AviationWeatherAPIClient:
             bool: True if connection successful, False otherwise
         """
         try:
-            # Test with a single airport
-            test_codes = ['KORD']
-            self.get_metar_data(test_codes, hours=1)
-            if loglevel <= 2:  # Only log if info level is enabled
-                logger.info("API connection test successful")
-            return True
-        except Exception as e:
-            logger.error(f"API connection test failed: {e}")
+            # A HEAD request for one station proves the endpoint answers without downloading a report;
+            # rate limiting, auth and not-found replies count as failures just like server errors
+            response = self._session.head(self._metar_tpl.format(hours=1) + 'KORD', timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.error("API connection test failed: %s", e)
             return False
+        
+        if loglevel <= 2:  # Only log if info level is enabled
+            logger.info("API connection test successful")
+        return True
 
 def create_api_client():
     """Create and return an API client instance."""
@@ -528,13 +900,13 @@ if __name__ == '__main__':
     try:
         airports = ['KORD', 'KJFK', 'KLAX']
         metar_data = client.get_metar_data(airports)
-        print(f"Retrieved METAR data for {len(metar_data.findall('.//METAR'))} airports")
+        print(f"Retrieved METAR data for {count_metars(metar_data)} airports")
     except AviationWeatherAPIError as e:
         print(f"METAR request failed: {e}")
     
     # Test TAF request
     try:
         taf_data = client.get_taf_data(airports)
-        print(f"Retrieved TAF data for {len(taf_data.findall('.//TAF'))} airports")
+        print(f"Retrieved TAF data for {len(_FIND_REPORTS['TAF'](taf_data))} airports")
     except AviationWeatherAPIError as e:
         print(f"TAF request failed: {e}")
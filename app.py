@@ -1562,7 +1562,9 @@ def get_led_map_info():
 
         while True:  # check internet availability and retry if necessary. If house power outage, map may boot quicker than router.
             try:
-                content = urllib.request.urlopen(lmu_tmp).read()
+                response = requests.get(lmu_tmp)  # requests asks for gzip and decompresses it
+                response.raise_for_status()
+                content = response.content
                 logger.info('Internet Available')
                 logger.info(lmu_tmp)
                 break
@@ -1638,7 +1640,9 @@ def get_apinfo():
         while internet_test:  # check internet availability and retry if necessary. If house power outage, map may boot quicker than router.
             try:
                 #                s.connect(("8.8.8.8", 80))
-                content = urllib.request.urlopen(apurl).read()
+                response = requests.get(apurl)  # requests asks for gzip and decompresses it
+                response.raise_for_status()
+                content = response.content
                 logger.info('Internet Available')
                 logger.info(apurl)
                 break
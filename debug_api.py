@@ -3,8 +3,13 @@
 Debug script to see what's actually in the API response.
 """
 
-import urllib.request
-import xml.etree.ElementTree as ET
+# lxml parses the response bytes with libxml2 when available; the stdlib parser has the same API
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+from api_client import create_api_client
 
 def debug_api_response():
     """Debug the API response to see what data we're getting."""
@@ -14,13 +19,14 @@ def debug_api_response():
         # Make real API call to get KSRQ data
         api_url = "https://aviationweather.gov/api/data/metar?ids=ksrq&format=xml&hours=2.5"
         
-        with urllib.request.urlopen(api_url, timeout=10) as response:
-            xml_data = response.read()
+        # Reuse the API client's session, timeouts and retries
+        client = create_api_client()
+        xml_data = client._make_single_request(api_url)
         
         print(f"Response length: {len(xml_data)} bytes")
         print("Raw XML response:")
         print("-" * 50)
-        print(xml_data.decode('utf-8')[:1000])  # First 1000 characters
+        print(xml_data[:1000].decode('utf-8', errors='replace'))  # First 1000 bytes
         print("-" * 50)
         
         # Parse the XML
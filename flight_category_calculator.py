@@ -4,20 +4,267 @@ Flight Category Calculator for 2025 AviationWeather.gov API.
 Calculates VFR/MVFR/IFR/LIFR categories from cloud and visibility data.
 """
 
+import functools
 import logging
-from typing import Optional, List, Dict, Any
+import re
+import sys
+from typing import Optional, List, Dict, Any, NamedTuple, Union
+
+# NumPy speeds up batch evaluation; fall back to the scalar rules if it is not installed
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    np = None
+    HAVE_NUMPY = False
+
+# Compiled XPath lookups for lxml elements (e.g. from api_client); stdlib elements use findall
+try:
+    from lxml import etree as _lxml_etree
+    _LXML_ELEMENT = _lxml_etree._Element
+    _XP_CLOUD = _lxml_etree.XPath('cloud')
+    _XP_SKY_CONDITION = _lxml_etree.XPath('sky_condition')
+    _XP_FLIGHT_CATEGORY = _lxml_etree.XPath('string(flight_category)')
+except ImportError:
+    _LXML_ELEMENT = None
 
 # Import configuration
 import config
 from log import logger
+from api_client import _iterparse_tag
+
+# Configuration read once at import rather than per calculator
+_LOG_CALCULATION = getattr(config, 'log_flight_category_calculation', 1)
+_FORCE_FALLBACK = getattr(config, 'force_fallback_calculation', 1)
+
+# Category colors; unknown categories use the no-weather color
+_COLOR_MAP = {
+    'VFR': getattr(config, 'color_vfr', (0, 255, 0)),
+    'MVFR': getattr(config, 'color_mvfr', (0, 0, 255)),
+    'IFR': getattr(config, 'color_ifr', (255, 0, 0)),
+    'LIFR': getattr(config, 'color_lifr', (255, 0, 255)),
+    'NONE': getattr(config, 'color_nowx', (242, 138, 37))
+}
+
+# Category codes used by the batch path, ordered from most to least restrictive
+CATEGORY_NAMES = ('LIFR', 'IFR', 'MVFR', 'VFR')
+
+# Flight categories accepted from the API, mapped to this module's own string objects
+_API_CATEGORIES = {name: name for name in CATEGORY_NAMES}
+
+# Values accepted by validate_flight_category
+_VALID_CATEGORIES = frozenset(CATEGORY_NAMES + ('NONE',))
+
+# Sky cover values that constitute a ceiling
+_CEILING_COVERS = frozenset(('OVC', 'BKN', 'OVX'))
+
+class CloudLayer(NamedTuple):
+    """One cloud layer; a tuple is far smaller than the equivalent dict."""
+    sky_cover: str
+    cloud_base_ft_agl: Any
+
+def _determine_code(ceiling_ft, visibility_mi):
+    """
+    Return the CATEGORY_NAMES index for a ceiling/visibility pair.
+    
+    Categories are tested from most to least common in real feeds (VFR
+    first), so the typical station returns after a single check. Each check
+    only needs its lower bound, since better categories have already been
+    ruled out.
+    
+    Args:
+        ceiling_ft: Ceiling height in feet AGL
+        visibility_mi: Visibility in statute miles
+        
+    Returns:
+        int: 0 (LIFR), 1 (IFR), 2 (MVFR) or 3 (VFR)
+    """
+    # Written as negated limits so an unparseable (NaN) visibility still reads as VFR
+    if not (ceiling_ft <= 3000 or visibility_mi <= 5.0):
+        return 3
+    if not (ceiling_ft < 1000 or visibility_mi < 3.0):
+        return 2
+    if not (ceiling_ft < 500 or visibility_mi < 1.0):
+        return 1
+    return 0
+
+def _find_cloud_elements(element):
+    """
+    Find the cloud layer children of a METAR/forecast XML element.
+    
+    Nested <cloud> children are preferred; flat <sky_condition> children
+    are used when there are none.
+    
+    Args:
+        element: XML element (lxml or ElementTree)
+        
+    Returns:
+        list: Cloud layer elements
+    """
+    if _LXML_ELEMENT is not None and isinstance(element, _LXML_ELEMENT):
+        return _XP_CLOUD(element) or _XP_SKY_CONDITION(element)
+    return element.findall('cloud') or element.findall('sky_condition')
+
+def _coerce_ceiling(base):
+    """
+    Convert a cloud base that is not a plain ASCII digit string to feet.
+    
+    Args:
+        base: Cloud base value (numeric, or a string with sign/whitespace)
+        
+    Returns:
+        int: Cloud base in feet AGL, or None if it cannot be converted
+    """
+    try:
+        return int(base)
+    except (ValueError, TypeError):
+        return None
+
+def _layers_from_dict(clouds_data):
+    """Cloud layers of a dict with a 'clouds' list or a single 'sky_condition'."""
+    if 'clouds' in clouds_data:
+        return clouds_data['clouds']
+    if 'sky_condition' in clouds_data:
+        return (clouds_data['sky_condition'],)
+    return ()
+
+def _layers_from_list(clouds_data):
+    """Cloud layers given directly as a list."""
+    return clouds_data
+
+def _no_layers(clouds_data):
+    """Input that carries no cloud layers."""
+    return ()
+
+def _cloud_source_for(data_type):
+    """Pick the cloud layer source for a type, using the same precedence as before dispatch."""
+    if hasattr(data_type, 'findall'):
+        return _find_cloud_elements
+    if issubclass(data_type, dict):
+        return _layers_from_dict
+    if issubclass(data_type, list):
+        return _layers_from_list
+    return _no_layers
+
+# Cloud layer source per input type; element types are added the first time they are seen
+_CLOUD_SOURCES = {dict: _layers_from_dict, list: _layers_from_list, type(None): _no_layers}
+
+def _raw_cloud_layers(clouds_data):
+    """
+    Return the cloud layer entries of raw cloud data without copying them.
+    
+    Dispatches on the input type through _CLOUD_SOURCES instead of probing
+    each input with hasattr/isinstance. XML elements and dicts share the
+    .get interface, so callers can read either directly.
+    
+    Args:
+        clouds_data: Cloud data (XML element, dict or list)
+        
+    Returns:
+        Sequence of cloud layer elements or dicts
+    """
+    data_type = type(clouds_data)
+    source = _CLOUD_SOURCES.get(data_type)
+    if source is None:
+        source = _CLOUD_SOURCES[data_type] = _cloud_source_for(data_type)
+    return source(clouds_data)
+
+def _visibility_value(value):
+    """Normalize a single visibility value, treating empty values as unlimited."""
+    if not value:
+        return 999.0
+    return _normalize_visibility(str(value).strip())
+
+def _visibility_from_mapping(visibility_data):
+    """Visibility from an XML element or dict: statute_mi attribute/key, then element text."""
+    statute_mi = visibility_data.get('statute_mi', '999')
+    if statute_mi != '999':
+        return _visibility_value(statute_mi)
+    text = getattr(visibility_data, 'text', None)
+    if text:
+        return _visibility_value(text)
+    return 999.0
+
+def _no_visibility(visibility_data):
+    """Input that carries no visibility."""
+    return 999.0
+
+def _visibility_reader_for(data_type):
+    """Pick the visibility reader for a type, using the same precedence as before dispatch."""
+    if hasattr(data_type, 'get'):
+        return _visibility_from_mapping
+    if issubclass(data_type, (int, float, str)):
+        return _visibility_value
+    return _no_visibility
+
+# Visibility reader per input type; element types are added the first time they are seen
+_VISIBILITY_READERS = {
+    dict: _visibility_from_mapping,
+    str: _visibility_value,
+    float: _visibility_value,
+    int: _visibility_value,
+    type(None): _no_visibility,
+}
+
+# Fraction visibilities: "1/2" or a whole number and a fraction like "1 1/2"
+_FRACTION_RE = re.compile(r'(?:(\S+)\s+)?([^\s/]+)/([^\s/]+)')
+
+@functools.lru_cache(maxsize=512)
+def _parse_visibility(visibility_str):
+    """
+    Parse a stripped visibility string to float miles.
+    
+    METAR feeds repeat a small set of visibility strings, so results are
+    cached by string. Nothing is logged here; see _normalize_visibility.
+    
+    Args:
+        visibility_str (str): Stripped visibility value
+        
+    Returns:
+        float: Visibility in statute miles, or None if unparseable
+    """
+    try:
+        # Handle "10+" format
+        if visibility_str.endswith('+'):
+            return float(visibility_str[:-1])
+        
+        # Handle "P6SM" format (P = Plus, SM = Statute Miles)
+        if visibility_str.startswith('P') and visibility_str.endswith('SM'):
+            return float(visibility_str[1:-2])
+        
+        # Handle fractional values like "1/2" or "1 1/2" in a single match
+        if '/' in visibility_str:
+            match = _FRACTION_RE.fullmatch(visibility_str)
+            if match:
+                whole_part, numerator, denominator = match.groups()
+                fractional_part = float(numerator) / float(denominator)
+                if whole_part is None:
+                    return fractional_part
+                return float(whole_part) + fractional_part
+        
+        # Handle regular numbers
+        return float(visibility_str)
+        
+    except (ValueError, ZeroDivisionError):
+        return None
+
+def _normalize_visibility(visibility_str):
+    """Parse a stripped visibility string, warning about every unparseable value."""
+    visibility = _parse_visibility(visibility_str)
+    if visibility is None:
+        logger.warning("Could not parse visibility value: %s", visibility_str)
+        return 999.0  # Default to unlimited visibility
+    return visibility
 
 class FlightCategoryCalculator:
     """Calculator for determining flight categories from weather data."""
     
     def __init__(self):
         """Initialize the calculator with configuration."""
-        self.log_calculation = getattr(config, 'log_flight_category_calculation', 1)
-        self.force_fallback = getattr(config, 'force_fallback_calculation', 1)
+        self.log_calculation = _LOG_CALCULATION
+        self.force_fallback = _FORCE_FALLBACK
+        self._color_map = _COLOR_MAP
+        self._color_nowx = _COLOR_MAP['NONE']
     
     def calculate_flight_category(self, clouds_data: Any, visibility_data: Any) -> str:
         """
@@ -32,8 +279,7 @@ class FlightCategoryCalculator:
         """
         try:
             # Parse cloud data
-            cloud_layers = self.parse_cloud_layers(clouds_data)
-            lowest_ceiling = self.get_lowest_ceiling(cloud_layers)
+            lowest_ceiling = self._lowest_ceiling_from_raw(clouds_data)
             
             # Parse visibility data
             visibility_mi = self.parse_visibility(visibility_data)
@@ -41,83 +287,116 @@ class FlightCategoryCalculator:
             # Calculate flight category
             flight_category = self._determine_flight_category(lowest_ceiling, visibility_mi)
             
-            if self.log_calculation:
-                logger.debug(f"Flight category calculation: ceiling={lowest_ceiling}ft, visibility={visibility_mi}mi -> {flight_category}")
+            if self.log_calculation and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Flight category calculation: ceiling=%sft, visibility=%smi -> %s",
+                             lowest_ceiling, visibility_mi, flight_category)
             
             return flight_category
             
         except Exception as e:
-            logger.warning(f"Error calculating flight category: {e}")
+            logger.warning("Error calculating flight category: %s", e)
             return "VFR"  # Default to VFR on error
     
-    def parse_cloud_layers(self, clouds_data: Any) -> List[Dict[str, Any]]:
+    def parse_cloud_layers(self, clouds_data: Any, as_dict: bool = False) -> List[Union[CloudLayer, Dict[str, Any]]]:
         """
         Parse cloud layers from XML or dict data.
         Enhanced to handle both nested (<clouds><cloud>) and flat (<sky_condition>) structures.
         
         Args:
             clouds_data: Cloud data element
+            as_dict: Return layers as {'sky_cover', 'cloud_base_ft_agl'} dicts
+                instead of CloudLayer tuples
             
         Returns:
-            List[Dict]: List of cloud layer dictionaries
+            List[CloudLayer]: List of cloud layers (dicts if as_dict is set)
         """
         cloud_layers = []
-        
-        if clouds_data is None:
-            return cloud_layers
+        intern = sys.intern
         
         try:
-            # Handle XML element with findall method (nested structure)
-            if hasattr(clouds_data, 'findall'):
-                # Try nested clouds structure first
-                for cloud_elem in clouds_data.findall('cloud'):
-                    layer = {
-                        'sky_cover': cloud_elem.get('sky_cover', 'SKC'),
-                        'cloud_base_ft_agl': cloud_elem.get('cloud_base_ft_agl', '9999')
-                    }
-                    cloud_layers.append(layer)
-                
-                # If no nested clouds found, try flat sky_condition structure
-                if not cloud_layers:
-                    for sky_cond in clouds_data.findall('sky_condition'):
-                        layer = {
-                            'sky_cover': sky_cond.get('sky_cover', 'SKC'),
-                            'cloud_base_ft_agl': sky_cond.get('cloud_base_ft_agl', '9999')
-                        }
-                        cloud_layers.append(layer)
-            
-            # Handle dict data
-            elif isinstance(clouds_data, dict):
-                if 'clouds' in clouds_data:
-                    for cloud in clouds_data['clouds']:
-                        layer = {
-                            'sky_cover': cloud.get('sky_cover', 'SKC'),
-                            'cloud_base_ft_agl': cloud.get('cloud_base_ft_agl', '9999')
-                        }
-                        cloud_layers.append(layer)
-                elif 'sky_condition' in clouds_data:
-                    # Handle flat structure in dict
-                    sky_cond = clouds_data['sky_condition']
-                    layer = {
-                        'sky_cover': sky_cond.get('sky_cover', 'SKC'),
-                        'cloud_base_ft_agl': sky_cond.get('cloud_base_ft_agl', '9999')
-                    }
-                    cloud_layers.append(layer)
-            
-            # Handle list data
-            elif isinstance(clouds_data, list):
-                for cloud in clouds_data:
-                    layer = {
-                        'sky_cover': cloud.get('sky_cover', 'SKC'),
-                        'cloud_base_ft_agl': cloud.get('cloud_base_ft_agl', '9999')
-                    }
-                    cloud_layers.append(layer)
+            for cloud in _raw_cloud_layers(clouds_data):
+                # Sky cover comes from a handful of codes; interning shares one string
+                # per code across all stored layers and keeps its hash precomputed
+                sky_cover = cloud.get('sky_cover', 'SKC')
+                if sky_cover.__class__ is str:
+                    sky_cover = intern(sky_cover)
+                cloud_layers.append(CloudLayer(sky_cover, cloud.get('cloud_base_ft_agl', '9999')))
         
         except Exception as e:
-            logger.warning(f"Error parsing cloud layers: {e}")
+            logger.warning("Error parsing cloud layers: %s", e)
         
+        if as_dict:
+            return [layer._asdict() for layer in cloud_layers]
         return cloud_layers
     
+    def _lowest_ceiling_from_raw(self, clouds_data: Any) -> int:
+        """
+        Get the lowest ceiling directly from raw cloud data.
+        
+        Same inputs and rules as parse_cloud_layers followed by
+        get_lowest_ceiling, but done in one pass without building layer dicts.
+        
+        Args:
+            clouds_data: Cloud data (XML element, dict or list)
+            
+        Returns:
+            int: Lowest ceiling in feet AGL
+        """
+        lowest_ceiling = 9999  # Default to high ceiling
+        
+        try:
+            for layer in _raw_cloud_layers(clouds_data):
+                if layer.get('sky_cover', 'SKC') in _CEILING_COVERS:
+                    base = layer.get('cloud_base_ft_agl', '9999')
+                    ceiling = int(base) if base.__class__ is str and base.isascii() and base.isdecimal() else _coerce_ceiling(base)
+                    if ceiling is not None and ceiling < lowest_ceiling:
+                        lowest_ceiling = ceiling
+        
+        except Exception as e:
+            logger.warning("Error parsing cloud layers: %s", e)
+        
+        return lowest_ceiling
+    
+    def lowest_ceiling_batch(self, clouds_list):
+        """
+        Get the lowest ceiling for many stations at once.
+        
+        Ceiling bases of all stations are gathered into one flat array and
+        reduced per station with np.minimum.reduceat, rather than scanned in
+        a separate Python loop per station.
+        
+        Args:
+            clouds_list: Sequence of raw cloud data, one entry per station
+            
+        Returns:
+            numpy.ndarray: Lowest ceiling in feet AGL per station (a list when
+            NumPy is not installed)
+        """
+        if not HAVE_NUMPY:
+            return [self._lowest_ceiling_from_raw(clouds_data) for clouds_data in clouds_list]
+        
+        bases = []
+        offsets = []
+        ceiling_covers = _CEILING_COVERS
+        for clouds_data in clouds_list:
+            # Each station's segment starts with the default, so no segment is empty
+            offsets.append(len(bases))
+            bases.append(9999)
+            try:
+                for layer in _raw_cloud_layers(clouds_data):
+                    if layer.get('sky_cover', 'SKC') in ceiling_covers:
+                        base = layer.get('cloud_base_ft_agl', '9999')
+                        ceiling = int(base) if base.__class__ is str and base.isascii() and base.isdecimal() else _coerce_ceiling(base)
+                        if ceiling is not None:
+                            bases.append(ceiling)
+            except Exception as e:
+                logger.warning("Error parsing cloud layers: %s", e)
+        
+        if not offsets:
+            return np.empty(0, dtype=np.int64)
+        
+        return np.minimum.reduceat(np.array(bases, dtype=np.int64), offsets)
+    
     def parse_visibility(self, visibility_data: Any) -> float:
         """
         Parse visibility from XML or dict data.
@@ -129,30 +408,16 @@ class FlightCategoryCalculator:
         Returns:
             float: Visibility in statute miles
         """
+        data_type = type(visibility_data)
+        reader = _VISIBILITY_READERS.get(data_type)
+        if reader is None:
+            reader = _VISIBILITY_READERS[data_type] = _visibility_reader_for(data_type)
+        
         try:
-            # Handle XML element
-            if hasattr(visibility_data, 'get'):
-                # Try nested structure first
-                statute_mi = visibility_data.get('statute_mi', '999')
-                if statute_mi != '999':
-                    return self.normalize_visibility_value(statute_mi)
-                
-                # Try flat structure
-                if hasattr(visibility_data, 'text') and visibility_data.text:
-                    return self.normalize_visibility_value(visibility_data.text)
-            
-            # Handle dict data
-            elif isinstance(visibility_data, dict):
-                statute_mi = visibility_data.get('statute_mi', '999')
-                if statute_mi != '999':
-                    return self.normalize_visibility_value(statute_mi)
-            
-            # Handle direct value
-            elif isinstance(visibility_data, (int, float, str)):
-                return self.normalize_visibility_value(visibility_data)
+            return reader(visibility_data)
         
         except (ValueError, TypeError) as e:
-            logger.warning(f"Error parsing visibility: {e}")
+            logger.warning("Error parsing visibility: %s", e)
         
         return 999.0  # Default to unlimited visibility
     
@@ -173,68 +438,39 @@ class FlightCategoryCalculator:
         Returns:
             float: Normalized visibility in statute miles
         """
-        if not visibility_str:
-            return 999.0
-        
-        visibility_str = str(visibility_str).strip()
-        
-        try:
-            # Handle "10+" format
-            if visibility_str.endswith('+'):
-                return float(visibility_str[:-1])
-            
-            # Handle "P6SM" format (P = Plus, SM = Statute Miles)
-            if visibility_str.startswith('P') and visibility_str.endswith('SM'):
-                return float(visibility_str[1:-2])
-            
-            # Handle fractional values like "1/2" or "1 1/2"
-            if '/' in visibility_str:
-                parts = visibility_str.split()
-                if len(parts) == 1:
-                    # Simple fraction like "1/2"
-                    numerator, denominator = parts[0].split('/')
-                    return float(numerator) / float(denominator)
-                elif len(parts) == 2:
-                    # Mixed number like "1 1/2"
-                    whole_part = float(parts[0])
-                    numerator, denominator = parts[1].split('/')
-                    fractional_part = float(numerator) / float(denominator)
-                    return whole_part + fractional_part
-            
-            # Handle regular numbers
-            return float(visibility_str)
-            
-        except (ValueError, ZeroDivisionError):
-            logger.warning(f"Could not parse visibility value: {visibility_str}")
-            return 999.0  # Default to unlimited visibility
+        return _visibility_value(visibility_str)
     
-    def get_lowest_ceiling(self, cloud_layers: List[Dict[str, Any]]) -> int:
+    def get_lowest_ceiling(self, cloud_layers: List[Union[CloudLayer, Dict[str, Any]]]) -> int:
         """
         Get the lowest ceiling from cloud layers.
         
         Args:
-            cloud_layers: List of cloud layer dictionaries
+            cloud_layers: List of CloudLayer tuples or cloud layer dictionaries
             
         Returns:
             int: Lowest ceiling in feet AGL
         """
         lowest_ceiling = 9999  # Default to high ceiling
+        ceiling_covers = _CEILING_COVERS
         
         for layer in cloud_layers:
-            sky_cover = layer.get('sky_cover', 'SKC')
+            if layer.__class__ is CloudLayer:
+                sky_cover, base = layer
+            else:
+                sky_cover = layer.get('sky_cover', 'SKC')
+                base = layer.get('cloud_base_ft_agl', '9999')
             
             # Only consider OVC, BKN, and OVX layers
-            if sky_cover in ('OVC', 'BKN', 'OVX'):
-                try:
-                    ceiling = int(layer.get('cloud_base_ft_agl', '9999'))
-                    if ceiling < lowest_ceiling:
-                        lowest_ceiling = ceiling
-                except (ValueError, TypeError):
-                    continue
+            if sky_cover in ceiling_covers:
+                # Plain ASCII digit strings (the usual case) skip the exception handling
+                ceiling = int(base) if base.__class__ is str and base.isascii() and base.isdecimal() else _coerce_ceiling(base)
+                if ceiling is not None and ceiling < lowest_ceiling:
+                    lowest_ceiling = ceiling
         
         return lowest_ceiling
     
-    def _determine_flight_category(self, ceiling_ft: int, visibility_mi: float) -> str:
+    @staticmethod
+    def _determine_flight_category(ceiling_ft: int, visibility_mi: float) -> str:
         """
         Determine flight category based on ceiling and visibility.
         
@@ -251,20 +487,46 @@ class FlightCategoryCalculator:
         Returns:
             str: Flight category
         """
-        # Check for LIFR conditions
-        if ceiling_ft < 500 or visibility_mi < 1.0:
-            return "LIFR"
+        return CATEGORY_NAMES[_determine_code(ceiling_ft, visibility_mi)]
+    
+    def determine_flight_category_batch(self, ceilings_ft, visibilities_mi, sky_covers=None):
+        """
+        Determine flight categories for many stations at once.
         
-        # Check for IFR conditions
-        if (500 <= ceiling_ft < 1000) or (1.0 <= visibility_mi < 3.0):
-            return "IFR"
+        Applies the same rules as _determine_flight_category, but evaluates
+        whole arrays at once: ceilings and visibilities are each binned into
+        a category code with np.searchsorted, and the station's category is
+        the more restrictive of the two.
         
-        # Check for MVFR conditions
-        if (1000 <= ceiling_ft <= 3000) or (3.0 <= visibility_mi <= 5.0):
-            return "MVFR"
+        Args:
+            ceilings_ft: Sequence or array of ceiling heights in feet AGL
+            visibilities_mi: Sequence or array of visibilities in statute miles
+            sky_covers: Optional sequence of the sky cover reported with each
+                ceiling height; heights whose cover is not OVC/BKN/OVX do not
+                form a ceiling and are ignored
+            
+        Returns:
+            numpy.ndarray: Flight category strings, one per station (a list
+            when NumPy is not installed)
+        """
+        if not HAVE_NUMPY:
+            if sky_covers is not None:
+                ceilings_ft = [ceiling if cover in _CEILING_COVERS else float('inf')
+                               for ceiling, cover in zip(ceilings_ft, sky_covers)]
+            return [self._determine_flight_category(ceiling, visibility)
+                    for ceiling, visibility in zip(ceilings_ft, visibilities_mi)]
         
-        # Default to VFR
-        return "VFR"
+        ceilings = np.asarray(ceilings_ft)
+        visibilities = np.asarray(visibilities_mi, dtype=float)
+        
+        ceiling_codes = np.searchsorted(_CEILING_BINS, ceilings, side='right')
+        if sky_covers is not None:
+            is_ceiling = np.isin(np.asarray(sky_covers), _CEILING_COVER_ARRAY)
+            ceiling_codes = np.where(is_ceiling, ceiling_codes, len(_CEILING_BINS))
+        visibility_codes = np.searchsorted(_VISIBILITY_BINS, visibilities, side='right')
+        codes = np.minimum(ceiling_codes, visibility_codes)
+        
+        return _CATEGORY_ARRAY[codes]
     
     def calculate_from_metar_element(self, metar_element) -> str:
         """
@@ -278,33 +540,118 @@ class FlightCategoryCalculator:
             str: Flight category
         """
         try:
-            # Try to get API-provided flight category first
-            flight_category_elem = metar_element.find('flight_category')
-            if (flight_category_elem is not None and 
-                flight_category_elem.text is not None and 
-                flight_category_elem.text.strip() != '' and 
-                flight_category_elem.text.strip() != 'NONE'):
-                return flight_category_elem.text.strip()
+            # Use the API-provided flight category when there is one
+            flight_category = self._try_api_category(metar_element)
+            if flight_category is not None:
+                return flight_category
             
             # Fall back to manual calculation
-            # Try nested clouds structure first
-            clouds_elem = metar_element.find('clouds')
-            if clouds_elem is None:
-                # Try flat sky_condition structure
-                clouds_elem = metar_element
-            
-            # Try nested visibility structure first
-            visibility_elem = metar_element.find('visibility')
-            if visibility_elem is None:
-                # Try flat visibility_statute_mi structure
-                visibility_elem = metar_element.find('visibility_statute_mi')
-            
+            clouds_elem, visibility_elem = self._metar_inputs(metar_element)
             return self.calculate_flight_category(clouds_elem, visibility_elem)
         
         except Exception as e:
-            logger.warning(f"Error calculating flight category from METAR element: {e}")
+            logger.warning("Error calculating flight category from METAR element: %s", e)
             return "VFR"
     
+    def _metar_inputs(self, metar_element):
+        """
+        Locate the cloud and visibility data of a METAR element.
+        
+        Args:
+            metar_element: METAR XML element
+            
+        Returns:
+            tuple: (clouds element, visibility element or None)
+        """
+        # Try nested clouds structure first, else the flat sky_condition children
+        clouds_elem = metar_element.find('clouds')
+        if clouds_elem is None:
+            clouds_elem = metar_element
+        
+        # Try nested visibility structure first, else flat visibility_statute_mi
+        visibility_elem = metar_element.find('visibility')
+        if visibility_elem is None:
+            visibility_elem = metar_element.find('visibility_statute_mi')
+        
+        return clouds_elem, visibility_elem
+    
+    def calculate_batch(self, metar_elements) -> List[str]:
+        """
+        Calculate flight categories for many METAR elements at once.
+        
+        API-provided categories are used as-is. The remaining stations are
+        gathered and evaluated together with lowest_ceiling_batch and
+        determine_flight_category_batch instead of one at a time.
+        
+        Args:
+            metar_elements: Iterable of METAR XML elements
+            
+        Returns:
+            List[str]: Flight category per element, in input order
+        """
+        categories = []
+        pending = []  # positions in categories still to be calculated
+        clouds_list = []
+        visibilities = []
+        
+        for metar_element in metar_elements:
+            try:
+                category = self._try_api_category(metar_element)
+                if category is None:
+                    clouds_elem, visibility_elem = self._metar_inputs(metar_element)
+                    visibilities.append(self.parse_visibility(visibility_elem))
+                    clouds_list.append(clouds_elem)
+                    pending.append(len(categories))
+            except Exception as e:
+                logger.warning("Error calculating flight category from METAR element: %s", e)
+                category = "VFR"
+            categories.append(category)
+        
+        if pending:
+            ceilings = self.lowest_ceiling_batch(clouds_list)
+            for position, category in zip(pending, self.determine_flight_category_batch(ceilings, visibilities)):
+                categories[position] = str(category)
+        
+        return categories
+    
+    def calculate_from_metar_stream(self, source):
+        """
+        Calculate flight categories while streaming a METAR XML document.
+        
+        Reports are parsed incrementally and each one is removed from the
+        tree once its category is calculated, so memory use stays at about
+        one report rather than the whole feed.
+        
+        Args:
+            source: METAR XML as bytes, a file name or a binary file object
+            
+        Yields:
+            tuple: (station_id, flight_category) for each METAR
+        """
+        for elem in _iterparse_tag(source, 'METAR'):
+            yield elem.findtext('station_id'), self.calculate_from_metar_element(elem)
+    
+    def _try_api_category(self, metar_element) -> Optional[str]:
+        """
+        Get the flight category supplied by the API in a METAR element.
+        
+        Args:
+            metar_element: METAR XML element
+            
+        Returns:
+            Optional[str]: Flight category, or None if it is missing, NONE or
+            not a known category
+        """
+        if _LXML_ELEMENT is not None and isinstance(metar_element, _LXML_ELEMENT):
+            text = _XP_FLIGHT_CATEGORY(metar_element)
+        else:
+            text = metar_element.findtext('flight_category')
+        
+        if not text:
+            return None
+        
+        return _API_CATEGORIES.get(text.strip())
+    
     def calculate_from_metar_xml(self, metar_element) -> str:
         """
         Calculate flight category directly from METAR XML element.
@@ -338,7 +685,7 @@ class FlightCategoryCalculator:
             return self.calculate_flight_category(clouds_elem, visibility_elem)
         
         except Exception as e:
-            logger.warning(f"Error calculating flight category from TAF forecast: {e}")
+            logger.warning("Error calculating flight category from TAF forecast: %s", e)
             return "VFR"
     
     def get_flight_category_color(self, flight_category: str) -> tuple:
@@ -351,17 +698,10 @@ class FlightCategoryCalculator:
         Returns:
             tuple: RGB color tuple
         """
-        color_map = {
-            'VFR': getattr(config, 'color_vfr', (0, 255, 0)),
-            'MVFR': getattr(config, 'color_mvfr', (0, 0, 255)),
-            'IFR': getattr(config, 'color_ifr', (255, 0, 0)),
-            'LIFR': getattr(config, 'color_lifr', (255, 0, 255)),
-            'NONE': getattr(config, 'color_nowx', (242, 138, 37))
-        }
-        
-        return color_map.get(flight_category, color_map['NONE'])
+        return self._color_map.get(flight_category, self._color_nowx)
     
-    def validate_flight_category(self, flight_category: str) -> bool:
+    @staticmethod
+    def validate_flight_category(flight_category: str) -> bool:
         """
         Validate that flight category is a known value.
         
@@ -371,12 +711,30 @@ class FlightCategoryCalculator:
         Returns:
             bool: True if valid, False otherwise
         """
-        valid_categories = ['VFR', 'MVFR', 'IFR', 'LIFR', 'NONE']
-        return flight_category in valid_categories
+        return flight_category in _VALID_CATEGORIES
+
+if HAVE_NUMPY:
+    _CATEGORY_ARRAY = np.array(CATEGORY_NAMES)
+    _CEILING_COVER_ARRAY = np.array(sorted(_CEILING_COVERS))
+    
+    # Lower edges of the IFR, MVFR and VFR bins; the VFR edges sit just above the
+    # inclusive MVFR limits (3000 ft, 5 mi) so a right-sided search keeps them in MVFR
+    _CEILING_BINS = np.array([500.0, 1000.0, np.nextafter(3000.0, np.inf)])
+    _VISIBILITY_BINS = np.array([1.0, 3.0, np.nextafter(5.0, np.inf)])
+
+# Shared instance handed out by create_flight_category_calculator
+_DEFAULT_CALCULATOR = None
 
 def create_flight_category_calculator():
-    """Create and return a flight category calculator instance."""
-    return FlightCategoryCalculator()
+    """
+    Return the shared flight category calculator instance.
+    
+    The calculator keeps no per-call state, so one instance serves every caller.
+    """
+    global _DEFAULT_CALCULATOR
+    if _DEFAULT_CALCULATOR is None:
+        _DEFAULT_CALCULATOR = FlightCategoryCalculator()
+    return _DEFAULT_CALCULATOR
 
 # Example usage and testing
 if __name__ == '__main__':
@@ -1,5 +1,14 @@
 import time
-import random
+from array import array
+from functools import singledispatch
+from random import getrandbits
+# NumPy draws a whole random frame in one call; fall back to getrandbits per pixel
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    np = None
+    HAVE_NUMPY = False
 try:
     from rpi_ws281x import PixelStrip, Color
 except ModuleNotFoundError:
@@ -22,6 +31,32 @@ def Color(r, g, b):
     return int("0x{:02x}{:02x}{:02x}".format(r, g, b), 16)
 '''
 
+@singledispatch
+def _to_color(color):
+    # Packed 24-bit color for rpi_ws281x; black if the color cannot be converted
+    try:
+        return Color(color)
+    except Exception:
+        return Color(0, 0, 0)
+
+
+@_to_color.register(int)
+def _(color):
+    # Already a color value
+    return color
+
+
+@_to_color.register(tuple)
+@_to_color.register(list)
+def _(color):
+    if len(color) < 3:
+        return Color(0, 0, 0)
+    r, g, b = color[0], color[1], color[2]
+    if type(r) is int and type(g) is int and type(b) is int:
+        return (r << 16) | (g << 8) | b
+    return Color(int(r), int(g), int(b))
+
+
 class LedStrip:
     def __init__(self, count):
         self.strip = PixelStrip(count,
@@ -33,26 +68,35 @@ class LedStrip:
                                 LED_CHANNEL)
         self.strip.begin()
         self.number = self.strip.numPixels()
+        # rpi_ws281x strips support item assignment straight into the LED buffer,
+        # skipping the setPixelColor wrapper; the fake strip only has setPixelColor
+        if hasattr(type(self.strip), '__setitem__'):
+            self._set_led = self.strip.__setitem__
+        else:
+            self._set_led = self.strip.setPixelColor
+        # orange() always draws the same frame, so build it once
+        self._orange_frame = (0xFFA500,) * self.number
+        self._rng = np.random.default_rng() if HAVE_NUMPY else None
+        # Packed 24-bit colors for the whole strip; fill it and call flush() to draw a frame
+        self.buffer = array('I', [0]) * self.number
 
     def set_pixel_color(self, led, color):
-        # Convert color to proper format for rpi_ws281x
-        if isinstance(color, tuple) or isinstance(color, list):
-            # Convert RGB tuple to Color object
-            if len(color) >= 3:
-                color = Color(int(color[0]), int(color[1]), int(color[2]))
-            else:
-                color = Color(0, 0, 0)  # Default to black
-        elif isinstance(color, int):
-            # Already a color value
-            pass
-        else:
-            # Try to convert to Color object
-            try:
-                color = Color(color)
-            except:
-                color = Color(0, 0, 0)  # Default to black
-        
-        self.strip.setPixelColor(led, color)
+        # Packed ints are the common per-frame form; skip the dispatch for them
+        if type(color) is int:
+            self.strip.setPixelColor(led, color)
+            return
+        self.strip.setPixelColor(led, _to_color(color))
+
+    def set_pixels(self, colors):
+        # Set packed colors from pixel 0 and show them; render errors go to the caller
+        set_led = self._set_led
+        for led, color in enumerate(colors):
+            set_led(led, color)
+        self.strip.show()
+
+    def flush(self):
+        # Draw the contents of self.buffer
+        self.set_pixels(self.buffer)
 
     def show_pixels(self):
         try:
@@ -63,16 +107,23 @@ class LedStrip:
     def set_brightness(self, brightness):
         self.strip.setBrightness(brightness)
 
+    def random_frame(self):
+        # 24 random bits are a packed RGB color with 8 uniform bits per channel
+        if self._rng is not None:
+            return self._rng.integers(0, 1 << 24, self.number, dtype=np.uint32).tolist()
+        return [getrandbits(24) for _ in range(self.number)]
+
     def rainbow(self, times,delay):
-        for _ in range(times):
-            for i in range(self.number):
-                self.set_pixel_color(i, Color(random.randint(0, 255),
-                                              random.randint(0, 255),
-                                              random.randint(0, 255)))
-            self.show_pixels()
-            time.sleep(delay)
+        # One handler for the whole animation rather than one per frame
+        try:
+            for _ in range(times):
+                self.set_pixels(self.random_frame())
+                time.sleep(delay)
+        except Exception as e:
+            print(f"Error: {e} trying to show pixels")
 
     def orange(self):
-        for i in range(self.number):
-            self.set_pixel_color(i, 0xFFA500)
-        self.show_pixels()
+        try:
+            self.set_pixels(self._orange_frame)
+        except Exception as e:
+            print(f"Error: {e} trying to show pixels")
@@ -102,6 +102,12 @@ from api_client import create_api_client
 # Get log level from config
 loglevel = getattr(config, 'loglevel', 3)
 
+# Sky covers that form a ceiling (set membership is a hash lookup rather than a tuple scan)
+CEILING_COVERS = frozenset(("OVC","BKN","OVX"))
+
+# Columns of a MOS data line; compiled once instead of looked up per line read
+MOS_FIELD_RE = re.compile(r'\s?(\s*\S+)')
+
 def normalize_visibility_value(visibility_str):
     """
     Normalize visibility values from various formats to float miles.
@@ -124,6 +130,12 @@ def normalize_visibility_value(visibility_str):
     
     visibility_str = str(visibility_str).strip()
     
+    # Plain numbers ("10", "0.5") are the common case; none of the forms below parse as a float
+    try:
+        return float(visibility_str)
+    except ValueError:
+        pass
+    
     try:
         # Handle "10+" format
         if visibility_str.endswith('+'):
@@ -135,24 +147,20 @@ def normalize_visibility_value(visibility_str):
         
         # Handle fractional values like "1/2" or "1 1/2"
         if '/' in visibility_str:
-            parts = visibility_str.split()
-            if len(parts) == 1:
-                # Simple fraction like "1/2"
-                numerator, denominator = parts[0].split('/')
-                return float(numerator) / float(denominator)
-            elif len(parts) == 2:
+            # Whole part is empty for a simple fraction like "1/2"
+            whole_part, _, fraction = visibility_str.rpartition(' ')
+            numerator, _, denominator = fraction.partition('/')
+            fractional_part = float(numerator) / float(denominator)
+            if whole_part:
                 # Mixed number like "1 1/2"
-                whole_part = float(parts[0])
-                numerator, denominator = parts[1].split('/')
-                fractional_part = float(numerator) / float(denominator)
-                return whole_part + fractional_part
-        
-        # Handle regular numbers
-        return float(visibility_str)
-        
+                return float(whole_part) + fractional_part
+            return fractional_part
+
     except (ValueError, ZeroDivisionError):
-        logger.warning(f"Could not parse visibility value: {visibility_str}")
-        return 999.0  # Default to unlimited visibility
+        pass
+    
+    logger.warning(f"Could not parse visibility value: {visibility_str}")
+    return 999.0  # Default to unlimited visibility
 
 #****************************************************************************
 #* User defined items to be set below - Make changes to config.py, not here *
@@ -241,6 +249,9 @@ metar_age = config.metar_age            #Metar Age in HOURS. This will pull the
 use_reboot = admin.use_reboot           # Used to determine if board should reboot every day at time set in setting below.
 time_reboot = admin.time_reboot         # 24 hour time in this format, '2400' = midnight. Change these 2 settings in the admin.py file if desired.
 autorun = config.autorun                # Check to be sure Autorun on reboot is set to yes.
+prefer_api_flight_category = getattr(config, 'prefer_api_flight_category', 1)  #1 = Use the flight category reported by the API when present
+force_fallback_calculation = getattr(config, 'force_fallback_calculation', 0)  #1 = Always calculate flight category from clouds and visibility
+log_xml_parsing_details = getattr(config, 'log_xml_parsing_details', 1)        #1 = Log cloud and visibility parsing details per station
 
 # Set Colors in RGB. Change numbers in paranthesis as desired. The order should be (Red,Green,Blue). This setup works for the WS2812 model of LED strips.
 # WS2811 strips uses GRB colors, so change "rgb_grb = 0" above if necessary. Range is 0-255. (https://www.rapidtables.com/web/color/RGB_Color.html)
@@ -582,6 +593,7 @@ def assign_color(visits):
 toggle = 0                      #used for homeport display
 outerloop = 1                   #Set to TRUE for infinite outerloop
 display_num = 0
+client = create_api_client()    #One API client for the whole run, so its connection pool and response cache carry over between updates
 while (outerloop):
     display_num = display_num + 1
 
@@ -641,7 +653,6 @@ while (outerloop):
     # Thank you Daniel from pilotmap.co for the change to this routine that handles maps with more than 300 airports.
     if metar_taf_mos != 2 and metar_taf_mos != 3:
         # Use enhanced API client for robust batching
-        client = create_api_client()
         try:
             if metar_taf_mos == 1:  # METAR
                 root = client.get_metar_data(airports, hours=metar_age)
@@ -651,7 +662,7 @@ while (outerloop):
         except Exception as e:
             logger.error(f'Failed to retrieve weather data: {e}')
             # Continue with empty root to prevent script crash
-            root = ET.fromstring('<x><data num_results="0"></data></x>')
+            root = ET.fromstring('<response><data num_results="0"/></response>')
 
     if turnoffrefresh == 0:
         turnoff(strip) #turn off led before repainting them. If Rainbow stays on, it has hung up before this.
@@ -881,7 +892,7 @@ while (outerloop):
                 if cat in categories:
                     cat_counter += 1 #used to check if a category is not in mos report for airport
                     if cat == 'HR': #hour designation
-                        temp = (re.findall(r'\s?(\s*\S+)', value.rstrip()))     #grab all the hours from line read
+                        temp = (MOS_FIELD_RE.findall(value.rstrip()))     #grab all the hours from line read
                         for j in range(8):
                             tmp = temp[j].strip()
                             hour_dict[tmp] = '' #create hour dictionary based on mos data
@@ -910,14 +921,14 @@ while (outerloop):
                             cat_counter += 1
                             hour_dict = collections.OrderedDict() #clear out hour_dict for next airport
                             last_cat = cat
-                            temp = (re.findall(r'\s?(\s*\S+)', value.rstrip())) #add the actual line of data read
+                            temp = (MOS_FIELD_RE.findall(value.rstrip())) #add the actual line of data read
                             set_data()
                             hour_dict = collections.OrderedDict() #clear out hour_dict for next airport
 
                         else:
                             #continue to decode the next category data that was read.
                             last_cat = cat #store what the last read cat was.
-                            temp = (re.findall(r'\s?(\s*\S+)', value.rstrip()))
+                            temp = (MOS_FIELD_RE.findall(value.rstrip()))
                             set_data()
                             hour_dict = collections.OrderedDict() #clear out hour_dict for next airport
 
@@ -1096,11 +1107,11 @@ while (outerloop):
                     #There can be multiple layers of clouds in each taf, but they are always listed lowest AGL first.
                     #Check the lowest (first) layer and see if it's overcast, broken, or obscured. If it is, then compare to cloud base height to set $
                     #This algorithm basically sets the flight category based on the lowest OVC, BKN or OVX layer.
-                    for sky_condition in forecast.findall('sky_condition'): #for each sky_condition from the XML
+                    for sky_condition in forecast.iterfind('sky_condition'): #for each sky_condition from the XML
                         sky_cvr = sky_condition.attrib['sky_cover']     #get the sky cover (BKN, OVC, SCT, etc)
                         logger.debug(sky_cvr) #debug
 
-                        if sky_cvr in ("OVC","BKN","OVX"): #If the layer is OVC, BKN or OVX, set Flight category based on height AGL
+                        if sky_cvr in CEILING_COVERS: #If the layer is OVC, BKN or OVX, set Flight category based on height AGL
 
                             try:
                                 cld_base_ft_agl = sky_condition.attrib['cloud_base_ft_agl'] #get cloud base AGL from XML
@@ -1233,11 +1244,6 @@ while (outerloop):
             # Routine contributed to project by Nick Cirincione. Thank you for your contribution.
             # Updated for 2025 API: Check if flight_category is provided, otherwise use fallback calculation
             
-            # Check configuration for API flight category preference
-            prefer_api_flight_category = getattr(config, 'prefer_api_flight_category', 1)
-            force_fallback_calculation = getattr(config, 'force_fallback_calculation', 0)
-            log_xml_parsing_details = getattr(config, 'log_xml_parsing_details', 1)
-            
             # Check if flight_category is provided in the 2025 API response
             flight_category_elem = metar.find('flight_category')
             api_flight_category_available = (flight_category_elem is not None and 
@@ -1273,7 +1279,7 @@ while (outerloop):
                             sky_cvr = sky_cond.get('sky_cover', 'SKC')
                             if log_xml_parsing_details:
                                 logger.debug(f"{stationId}: Sky Cover = {sky_cvr}")
-                            if sky_cvr in ("OVC","BKN","OVX"):
+                            if sky_cvr in CEILING_COVERS:
                                 sky_condition = sky_cond
                                 break
                     else:
@@ -1282,11 +1288,11 @@ while (outerloop):
                         if clouds_elem is not None:
                             if log_xml_parsing_details:
                                 logger.info(f"{stationId}: Using nested clouds structure")
-                            for cloud_layer in clouds_elem.findall('cloud'):
+                            for cloud_layer in clouds_elem.iterfind('cloud'):
                                 sky_cvr = cloud_layer.get('sky_cover', 'SKC')
                                 if log_xml_parsing_details:
                                     logger.debug(f"{stationId}: Sky Cover = {sky_cvr}")
-                                if sky_cvr in ("OVC","BKN","OVX"):
+                                if sky_cvr in CEILING_COVERS:
                                     sky_condition = cloud_layer
                                     break
                         else:
@@ -1294,29 +1300,29 @@ while (outerloop):
                             if metar.find('forecast') is None or metar.find('forecast') == 'NONE':
                                 if log_xml_parsing_details:
                                     logger.info('FAA xml data is NOT providing the forecast field for this airport')
-                                for sky_cond in metar.findall('./sky_condition'):   #for each sky_condition from the XML
+                                for sky_cond in metar.iterfind('./sky_condition'):   #for each sky_condition from the XML
                                     sky_cvr = sky_cond.attrib['sky_cover']     #get the sky cover (BKN, OVC, SCT, etc)
                                     if log_xml_parsing_details:
                                         logger.debug('Sky Cover = ' + sky_cvr)
-                                    if sky_cvr in ("OVC","BKN","OVX"): # Break out of for loop once we find one of these conditions
+                                    if sky_cvr in CEILING_COVERS: # Break out of for loop once we find one of these conditions
                                         sky_condition = sky_cond
                                         break
                             else:
                                 if log_xml_parsing_details:
                                     logger.info('FAA xml data IS providing the forecast field for this airport')
-                                for sky_cond in metar.findall('./forecast/sky_condition'):   #for each sky_condition from the XML
+                                for sky_cond in metar.iterfind('./forecast/sky_condition'):   #for each sky_condition from the XML
                                     sky_cvr = sky_cond.attrib['sky_cover']     #get the sky cover (BKN, OVC, SCT, etc)
                                     if log_xml_parsing_details:
                                         logger.debug('Sky Cover = ' + sky_cvr)
                                         logger.debug(metar.find('./forecast/fcst_time_from').text)
-                                    if sky_cvr in ("OVC","BKN","OVX"): # Break out of for loop once we find one of these conditions
+                                    if sky_cvr in CEILING_COVERS: # Break out of for loop once we find one of these conditions
                                         sky_condition = sky_cond
                                         break
                 except Exception as e:
                     logger.warning(f"Error parsing cloud data for {stationId}: {e}")
                     sky_cvr = "SKC"
 
-                if sky_cvr in ("OVC","BKN","OVX") and sky_condition is not None: #If the layer is OVC, BKN or OVX, set Flight category based on height AGL
+                if sky_cvr in CEILING_COVERS and sky_condition is not None: #If the layer is OVC, BKN or OVX, set Flight category based on height AGL
                     try:
                         # Try to get cloud base from sky_condition element
                         cld_base_ft_agl = None
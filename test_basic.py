@@ -3,8 +3,23 @@
 Basic test script that doesn't rely on metar_v4 imports.
 """
 
-import urllib.request
-import xml.etree.ElementTree as ET
+import re
+
+# Prefer lxml's C parser; fall back to the standard library if it is not installed
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+from api_client import create_api_client
+
+# Visibility forms: "P6SM", "10", "10+", "1/2" and "1 1/2"; numbers may be signed or start with a dot
+_NUMBER = r'[+-]?(?:\d+(?:\.\d*)?|\.\d+)'
+_VISIBILITY_RE = re.compile(
+    rf'(?:P(?P<greater>{_NUMBER})SM'
+    rf'|(?P<value>{_NUMBER})\+?'
+    rf'|(?:(?P<whole>{_NUMBER})\s+)?(?P<num>{_NUMBER})/(?P<den>{_NUMBER}))$'
+)
 
 def test_api_response():
     """Test what we get from the API."""
@@ -14,13 +29,15 @@ def test_api_response():
         # Make real API call to get KSRQ data
         api_url = "https://aviationweather.gov/api/data/metar?ids=ksrq&format=xml&hours=2.5"
         
-        with urllib.request.urlopen(api_url, timeout=10) as response:
-            xml_data = response.read()
-        
-        print(f"✓ Got {len(xml_data)} bytes from API")
-        
-        # Parse the XML
-        root = ET.fromstring(xml_data)
+        # Reuse the API client's pooled session (keep-alive, gzip, retries)
+        client = create_api_client()
+        with client._session.get(api_url, timeout=client.timeout, stream=True) as response:
+            response.raise_for_status()
+            print(f"✓ Got HTTP {response.status_code} from API")
+            
+            # Parse the XML straight from the (decompressed) socket stream
+            response.raw.decode_content = True
+            root = ET.parse(response.raw).getroot()
         
         # Check for data element
         data_elem = root.find('data')
@@ -83,33 +100,25 @@ def test_visibility_normalization():
                 return 999.0
             
             visibility_str = str(visibility_str).strip()
+            match = _VISIBILITY_RE.match(visibility_str)
+            if match is None:
+                # Other float() spellings such as "1e3" or "inf"
+                try:
+                    return float(visibility_str)
+                except ValueError:
+                    return 999.0
             
-            try:
-                # Handle "10+" format
-                if visibility_str.endswith('+'):
-                    return float(visibility_str[:-1])
-                
-                # Handle "P6SM" format
-                if visibility_str.startswith('P') and visibility_str.endswith('SM'):
-                    return float(visibility_str[1:-2])
-                
-                # Handle fractional values
-                if '/' in visibility_str:
-                    parts = visibility_str.split()
-                    if len(parts) == 1:
-                        numerator, denominator = parts[0].split('/')
-                        return float(numerator) / float(denominator)
-                    elif len(parts) == 2:
-                        whole_part = float(parts[0])
-                        numerator, denominator = parts[1].split('/')
-                        fractional_part = float(numerator) / float(denominator)
-                        return whole_part + fractional_part
-                
-                # Handle regular numbers
-                return float(visibility_str)
-                
-            except (ValueError, ZeroDivisionError):
+            numerator, denominator = match.group('num', 'den')
+            if numerator is None:
+                return float(match.group('value') or match.group('greater'))
+            
+            # Handle fractional values
+            denominator = float(denominator)
+            if not denominator:
                 return 999.0
+            value = float(numerator) / denominator
+            whole = match.group('whole')
+            return value + float(whole) if whole else value
         
         # Test cases
         test_cases = [
@@ -118,6 +127,10 @@ def test_visibility_normalization():
             ("P6SM", 6.0),
             ("1/2", 0.5),
             ("1 1/2", 1.5),
+            (".5", 0.5),
+            ("-1", -1.0),
+            ("1.5/2", 0.75),
+            ("1/0", 999.0),
             ("", 999.0),
             ("invalid", 999.0)
         ]
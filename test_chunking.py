@@ -5,7 +5,6 @@ Tests robust batching, deduplication, error handling, and configuration.
 """
 
 import unittest
-import xml.etree.ElementTree as ET
 import os
 import sys
 import socket
@@ -13,11 +12,20 @@ from datetime import datetime
 from unittest.mock import patch, MagicMock
 import urllib.error
 
+import requests
+from urllib3.exceptions import MaxRetryError
+
+# Prefer lxml's C parser; fall back to the standard library if it is not installed
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
 # Add the current directory to the path so we can import the modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Import the modules we're testing
-from api_client import AviationWeatherAPIClient, AviationWeatherAPIError
+from api_client import AviationWeatherAPIClient, AviationWeatherAPIError, _DeadlineRetry, _normalize_codes, _prepare_stations, _sortable_time, count_metars
 
 class TestChunkingLogic(unittest.TestCase):
     """Test the chunking logic for large airport lists."""
@@ -48,19 +56,32 @@ class TestChunkingLogic(unittest.TestCase):
             "kord", " KJFK ", "kLAX", "kord", "  KDFW  ", "kord", "KSEA"
         ]
         
-        # Simulate the normalization logic
-        normalized = list(set([code.strip().upper() for code in test_stations if code and code.strip()]))
+        normalized = _normalize_codes(test_stations)
         
+        # Duplicates removed, first-seen order kept
         expected = ["KORD", "KJFK", "KLAX", "KDFW", "KSEA"]
-        self.assertEqual(sorted(normalized), sorted(expected))
-        self.assertEqual(len(normalized), 5)  # Duplicates removed
+        self.assertEqual(normalized, expected)
+    
+    def test_prepare_stations_filters_and_joins(self):
+        """Test that placeholders are dropped and stations are sorted and pre-joined."""
+        stations, airport_string = _prepare_stations(("kord", "NULL", " KJFK ", "kord", "LGND", "  "))
+        
+        self.assertEqual(stations, ("KJFK", "KORD"))
+        self.assertEqual(airport_string, "KJFK,KORD")
+        
+        # The same stations in another order build the same request URL
+        self.assertEqual(_prepare_stations(("KORD", "KJFK"))[1], _prepare_stations(("KJFK", "KORD"))[1])
     
     def test_constants_loaded_correctly(self):
         """Test that all new constants are properly loaded."""
         self.assertEqual(self.client.MAX_PER_REQUEST, 380)
         self.assertEqual(self.client.REQUEST_TIMEOUT, 15)
         self.assertEqual(self.client.RETRIES, 3)
-        self.assertEqual(self.client.INTER_BATCH_SLEEP, 0.2)
+        self.assertEqual(self.client.MAX_CONCURRENT_BATCHES, 4)
+
+# Envelope of a real API response around the <data> section
+RESPONSE_HEADER = [b'<?xml version="1.0" encoding="UTF-8"?>', b'<response>']
+RESPONSE_FOOTER = [b'</response>']
 
 class TestDeduplicationLogic(unittest.TestCase):
     """Test deduplication by observation_time."""
@@ -71,28 +92,29 @@ class TestDeduplicationLogic(unittest.TestCase):
         
         # Create test XML with duplicate stations having different observation times
         self.duplicate_xml_content = [
-            '<data num_results="2">',
-            '<METAR station_id="KORD">',
-            '<observation_time>2025-01-06T10:00:00Z</observation_time>',
-            '<raw_text>KORD 061000Z 36010KT 10SM FEW250 15/02 A3012</raw_text>',
-            '</METAR>',
-            '<METAR station_id="KORD">',
-            '<observation_time>2025-01-06T12:00:00Z</observation_time>',
-            '<raw_text>KORD 061200Z 36010KT 10SM FEW250 15/02 A3012</raw_text>',
-            '</METAR>',
-            '<METAR station_id="KJFK">',
-            '<observation_time>2025-01-06T11:00:00Z</observation_time>',
-            '<raw_text>KJFK 061100Z 18015KT 8SM BKN100 12/05 A2998</raw_text>',
-            '</METAR>',
-            '</data>'
+            b'<data num_results="2">',
+            b'<METAR station_id="KORD">',
+            b'<observation_time>2025-01-06T10:00:00Z</observation_time>',
+            b'<raw_text>KORD 061000Z 36010KT 10SM FEW250 15/02 A3012</raw_text>',
+            b'</METAR>',
+            b'<METAR station_id="KORD">',
+            b'<observation_time>2025-01-06T12:00:00Z</observation_time>',
+            b'<raw_text>KORD 061200Z 36010KT 10SM FEW250 15/02 A3012</raw_text>',
+            b'</METAR>',
+            b'<METAR station_id="KJFK">',
+            b'<observation_time>2025-01-06T11:00:00Z</observation_time>',
+            b'<raw_text>KJFK 061100Z 18015KT 8SM BKN100 12/05 A2998</raw_text>',
+            b'</METAR>',
+            b'</data>'
         ]
     
     def test_deduplication_keeps_newest(self):
         """Test that deduplication keeps the most recent observation per station."""
-        result = self.client._merge_and_deduplicate_xml([self.duplicate_xml_content], "METAR")
+        content = b'\n'.join(self.duplicate_xml_content)
+        result = self.client._merge_and_deduplicate_xml([content], "METAR")
         
         # Should have 2 unique stations
-        metars = result.findall('.//METAR')
+        metars = result.findall('data/METAR')
         self.assertEqual(len(metars), 2)
         
         # Check that KORD has the newer observation time
@@ -102,27 +124,59 @@ class TestDeduplicationLogic(unittest.TestCase):
         obs_time = kord_metars[0].find('observation_time').text
         self.assertEqual(obs_time, '2025-01-06T12:00:00Z')
     
+    def test_taf_deduplication_uses_issue_time(self):
+        """Test that TAF deduplication keeps the most recently issued forecast."""
+        content = b'\n'.join([
+            b'<data num_results="2">',
+            b'<TAF><station_id>KORD</station_id><issue_time>2025-01-06T12:00:00Z</issue_time></TAF>',
+            b'<TAF><station_id>KORD</station_id><issue_time>2025-01-06T06:00:00Z</issue_time></TAF>',
+            b'</data>'
+        ])
+        result = self.client._merge_and_deduplicate_xml([content], "TAF")
+        
+        tafs = result.findall('data/TAF')
+        self.assertEqual(len(tafs), 1)
+        self.assertEqual(tafs[0].find('issue_time').text, '2025-01-06T12:00:00Z')
+    
     def test_iso8601_timestamp_parsing(self):
-        """Test ISO8601 timestamp parsing and comparison."""
-        # Test various timestamp formats
+        """Test that API timestamps compare chronologically as plain strings."""
+        # The API emits fixed-width YYYY-MM-DDTHH:MM:SSZ timestamps
         timestamps = [
             '2025-01-06T12:00:00Z',
             '2025-01-06T10:00:00Z',
             '2025-01-06T11:30:00Z'
         ]
         
-        parsed_times = []
         for ts in timestamps:
+            self.assertIs(_sortable_time(ts), ts)
             try:
-                parsed_time = datetime.fromisoformat(ts.replace('Z', '+00:00'))
-                parsed_times.append(parsed_time)
+                datetime.fromisoformat(ts.replace('Z', '+00:00'))
             except ValueError:
                 self.fail(f"Failed to parse timestamp: {ts}")
         
         # Should be sorted correctly
-        sorted_times = sorted(parsed_times)
-        self.assertEqual(sorted_times[0].isoformat(), '2025-01-06T10:00:00+00:00')
-        self.assertEqual(sorted_times[-1].isoformat(), '2025-01-06T12:00:00+00:00')
+        sorted_times = sorted(timestamps)
+        self.assertEqual(sorted_times[0], '2025-01-06T10:00:00Z')
+        self.assertEqual(sorted_times[-1], '2025-01-06T12:00:00Z')
+        
+        # Other ISO8601 forms are brought into the canonical form before comparing
+        self.assertEqual(_sortable_time('2025-01-06T07:00:00-05:00'), '2025-01-06T12:00:00Z')
+        self.assertEqual(_sortable_time('2025-01-06T12:00:00.000Z'), '2025-01-06T12:00:00Z')
+        self.assertEqual(_sortable_time(''), '')
+    
+    def test_deduplication_normalizes_timestamp_format(self):
+        """Test that a newer report wins even when its timestamp uses an offset."""
+        content = b'\n'.join([
+            b'<data num_results="2">',
+            b'<METAR><station_id>KORD</station_id><observation_time>2025-01-06T12:00:00Z</observation_time></METAR>',
+            b'<METAR><station_id>KORD</station_id><observation_time>2025-01-06T08:00:00-05:00</observation_time></METAR>',
+            b'</data>'
+        ])
+        result = self.client._merge_and_deduplicate_xml([content], "METAR")
+        
+        metars = result.findall('data/METAR')
+        self.assertEqual(len(metars), 1)
+        self.assertEqual(metars[0].find('observation_time').text, '2025-01-06T08:00:00-05:00')
 
 class TestErrorHandling(unittest.TestCase):
     """Test error handling scenarios."""
@@ -131,29 +185,101 @@ class TestErrorHandling(unittest.TestCase):
         """Set up test fixtures."""
         self.client = AviationWeatherAPIClient()
     
+    def test_retry_logic_with_exponential_backoff(self):
+        """Test that retries with exponential backoff are configured on the HTTP adapter."""
+        retries = self.client._session.get_adapter('https://aviationweather.gov').max_retries
+        
+        # RETRIES attempts in total, backing off from the configured retry delay
+        self.assertEqual(retries.total, self.client.retry_attempts - 1)
+        self.assertEqual(retries.backoff_factor, self.client.retry_delay)
+        for status in (429, 500, 502, 503, 504):
+            self.assertIn(status, retries.status_forcelist)
+        self.assertTrue(retries.respect_retry_after_header)
+        
+        # The final error response is returned so its status code can be reported
+        self.assertFalse(retries.raise_on_status)
+        self.assertEqual(retries.budget, self.client.timeout * self.client.retry_attempts)
+    
+    @patch('api_client.time.monotonic')
+    def test_retry_backoff_bounded_by_deadline(self, mock_monotonic):
+        """Test that retry backoff never sleeps past the request's time budget."""
+        template = _DeadlineRetry(total=5, backoff_factor=10, budget=30)
+        
+        # The clock starts at the first failed attempt
+        mock_monotonic.return_value = 100.0
+        retry = template.increment(method='GET', url='/metar')
+        self.assertEqual(retry.started, 100.0)
+        
+        # Jittered exponential backoff (between 10s and 10 * 2 = 20s) still applies inside the budget
+        mock_monotonic.return_value = 101.0
+        retry = retry.increment(method='GET', url='/metar')
+        self.assertTrue(10 <= retry.get_backoff_time() <= 20)
+        self.assertFalse(retry.is_exhausted())
+        
+        # ...but is clipped to what is left (up to 40s backoff, 5s left)
+        mock_monotonic.return_value = 125.0
+        retry = retry.increment(method='GET', url='/metar')
+        self.assertEqual(retry.get_backoff_time(), 5)
+        
+        # Once the budget is spent no further retry is allowed
+        mock_monotonic.return_value = 131.0
+        with self.assertRaises(MaxRetryError):
+            retry.increment(method='GET', url='/metar')
+    
+    @patch('api_client.random.uniform', side_effect=lambda low, high: high)
+    def test_first_retry_waits_with_jitter(self, mock_uniform):
+        """Test that the first retry waits at least backoff_factor and the wait is jittered."""
+        retry = _DeadlineRetry(total=3, backoff_factor=5, budget=60).increment(method='GET', url='/metar')
+        
+        # urllib3 alone would retry immediately after the first failure
+        self.assertEqual(retry.get_backoff_time(), 5)
+        mock_uniform.assert_called_with(5, 5)
+        
+        # Later waits are drawn between backoff_factor and the exponential backoff
+        retry = retry.increment(method='GET', url='/metar')
+        self.assertEqual(retry.get_backoff_time(), 10)
+        mock_uniform.assert_called_with(5, 10)
+    
     @patch('api_client.AviationWeatherAPIClient._make_single_request')
-    def test_retry_logic_with_exponential_backoff(self, mock_request):
-        """Test retry logic with exponential backoff."""
-        # Mock HTTP error that should trigger retries
+    def test_failed_batch_is_skipped(self, mock_request):
+        """Test that a batch still failing after the adapter's retries is skipped."""
         mock_request.side_effect = urllib.error.HTTPError(
             url="test", code=500, msg="Server Error", hdrs={}, fp=None
         )
         
-        with patch('time.sleep') as mock_sleep:
-            with self.assertRaises(AviationWeatherAPIError):
-                self.client._make_chunked_request(
-                    "https://test.com/api?ids=", 
-                    ["KORD", "KJFK"], 
-                    "METAR"
-                )
+        result = self.client._make_chunked_request(
+            "https://test.com/api?ids=", 
+            ["KORD", "KJFK"], 
+            "METAR"
+        )
         
-        # Should have made 3 attempts (RETRIES)
-        self.assertEqual(mock_request.call_count, 3)
+        # No extra retry loop on top of the adapter's
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(len(result.findall('data/METAR')), 0)
+    
+    def test_connection_uses_head_request(self):
+        """Test that the connection check is a HEAD request judged by status code."""
+        def response(status_code):
+            resp = requests.Response()
+            resp.status_code = status_code
+            return resp
         
-        # Should have slept with exponential backoff
-        expected_sleeps = [5, 10]  # retry_delay * (2^0), retry_delay * (2^1)
-        mock_sleep.assert_any_call(5)  # First retry
-        mock_sleep.assert_any_call(10)  # Second retry
+        with patch.object(self.client._session, 'head') as mock_head:
+            mock_head.return_value = response(200)
+            self.assertTrue(self.client.test_connection())
+            mock_head.assert_called_once_with(f"{self.client.base_url}/metar?format=xml&hours=1&ids=KORD",
+                                              timeout=self.client.timeout)
+            
+            mock_head.return_value = response(503)
+            self.assertFalse(self.client.test_connection())
+            
+            # Client errors (rate limited, forbidden, moved away) are failures too
+            for status_code in (401, 403, 404, 429):
+                mock_head.return_value = response(status_code)
+                self.assertFalse(self.client.test_connection())
+            
+            mock_head.side_effect = requests.exceptions.ConnectionError("unreachable")
+            self.assertFalse(self.client.test_connection())
     
     @patch('api_client.AviationWeatherAPIClient._make_single_request')
     def test_handles_204_no_content(self, mock_request):
@@ -171,7 +297,7 @@ class TestErrorHandling(unittest.TestCase):
         
         # Should return empty response
         self.assertIsNotNone(result)
-        metars = result.findall('.//METAR')
+        metars = result.findall('data/METAR')
         self.assertEqual(len(metars), 0)
     
     @patch('api_client.AviationWeatherAPIClient._make_single_request')
@@ -180,16 +306,15 @@ class TestErrorHandling(unittest.TestCase):
         # Mock timeout error
         mock_request.side_effect = socket.timeout("Request timed out")
         
-        with patch('time.sleep') as mock_sleep:
-            result = self.client._make_chunked_request(
-                "https://test.com/api?ids=", 
-                ["KORD", "KJFK"], 
-                "METAR"
-            )
+        result = self.client._make_chunked_request(
+            "https://test.com/api?ids=", 
+            ["KORD", "KJFK"], 
+            "METAR"
+        )
         
         # Should return empty response after retries
         self.assertIsNotNone(result)
-        metars = result.findall('.//METAR')
+        metars = result.findall('data/METAR')
         self.assertEqual(len(metars), 0)
 
 class TestIntegrationSmokeTest(unittest.TestCase):
@@ -204,37 +329,37 @@ class TestIntegrationSmokeTest(unittest.TestCase):
         """Test batch processing with mocked HTTP responses."""
         # Mock responses for two batches with overlapping stations
         batch1_xml = [
-            '<data num_results="2">',
-            '<METAR station_id="KORD">',
-            '<observation_time>2025-01-06T10:00:00Z</observation_time>',
-            '<raw_text>KORD 061000Z 36010KT 10SM FEW250 15/02 A3012</raw_text>',
-            '</METAR>',
-            '<METAR station_id="KJFK">',
-            '<observation_time>2025-01-06T10:00:00Z</observation_time>',
-            '<raw_text>KJFK 061000Z 18015KT 8SM BKN100 12/05 A2998</raw_text>',
-            '</METAR>',
-            '</data>'
+            b'<data num_results="2">',
+            b'<METAR station_id="KORD">',
+            b'<observation_time>2025-01-06T10:00:00Z</observation_time>',
+            b'<raw_text>KORD 061000Z 36010KT 10SM FEW250 15/02 A3012</raw_text>',
+            b'</METAR>',
+            b'<METAR station_id="KJFK">',
+            b'<observation_time>2025-01-06T10:00:00Z</observation_time>',
+            b'<raw_text>KJFK 061000Z 18015KT 8SM BKN100 12/05 A2998</raw_text>',
+            b'</METAR>',
+            b'</data>'
         ]
         
         batch2_xml = [
-            '<data num_results="2">',
-            '<METAR station_id="KORD">',  # Duplicate with newer time
-            '<observation_time>2025-01-06T12:00:00Z</observation_time>',
-            '<raw_text>KORD 061200Z 36010KT 10SM FEW250 15/02 A3012</raw_text>',
-            '</METAR>',
-            '<METAR station_id="KLAX">',
-            '<observation_time>2025-01-06T12:00:00Z</observation_time>',
-            '<raw_text>KLAX 061200Z 27008KT 10SM FEW200 20/10 A3015</raw_text>',
-            '</METAR>',
-            '</data>'
+            b'<data num_results="2">',
+            b'<METAR station_id="KORD">',  # Duplicate with newer time
+            b'<observation_time>2025-01-06T12:00:00Z</observation_time>',
+            b'<raw_text>KORD 061200Z 36010KT 10SM FEW250 15/02 A3012</raw_text>',
+            b'</METAR>',
+            b'<METAR station_id="KLAX">',
+            b'<observation_time>2025-01-06T12:00:00Z</observation_time>',
+            b'<raw_text>KLAX 061200Z 27008KT 10SM FEW200 20/10 A3015</raw_text>',
+            b'</METAR>',
+            b'</data>'
         ]
         
-        # Mock the responses with 8 dummy header lines and 1 dummy footer line
-        mock1 = ['h']*8 + batch1_xml + ['t']
-        mock2 = ['h']*8 + batch2_xml + ['t']
+        # Mock the responses as complete API documents
+        mock1 = RESPONSE_HEADER + batch1_xml + RESPONSE_FOOTER
+        mock2 = RESPONSE_HEADER + batch2_xml + RESPONSE_FOOTER
         mock_request.side_effect = [
-            '\n'.join(mock1).encode('utf-8'),
-            '\n'.join(mock2).encode('utf-8')
+            b'\n'.join(mock1),
+            b'\n'.join(mock2)
         ]
         
         # Test with 500 stations to trigger chunking
@@ -247,7 +372,7 @@ class TestIntegrationSmokeTest(unittest.TestCase):
         )
         
         # Should have 3 unique stations (KORD, KJFK, KLAX)
-        metars = result.findall('.//METAR')
+        metars = result.findall('data/METAR')
         self.assertEqual(len(metars), 3)
         
         # Verify KORD has the newer observation time
@@ -256,6 +381,66 @@ class TestIntegrationSmokeTest(unittest.TestCase):
         obs_time = kord_metars[0].find('observation_time').text
         self.assertEqual(obs_time, '2025-01-06T12:00:00Z')
     
+    def test_get_weather_fetches_metar_and_taf(self):
+        """Test that the combined poll returns both METAR and TAF results."""
+        with patch.object(AviationWeatherAPIClient, 'get_metar_data', return_value='metar') as mock_metar, \
+             patch.object(AviationWeatherAPIClient, 'get_taf_data', return_value='taf') as mock_taf:
+            result = self.client.get_weather(["KORD", "KJFK"], hours=1)
+        
+        self.assertEqual(result, ('metar', 'taf'))
+        mock_metar.assert_called_once_with(("KORD", "KJFK"), 1)
+        mock_taf.assert_called_once_with(("KORD", "KJFK"), 1)
+    
+    @patch('api_client.AviationWeatherAPIClient._make_single_request')
+    def test_repeated_request_served_from_cache(self, mock_request):
+        """Test that an identical request within the TTL does not hit the API again."""
+        mock_request.return_value = b'\n'.join(RESPONSE_HEADER + [
+            b'<data num_results="1">',
+            b'<METAR><station_id>KORD</station_id></METAR>',
+            b'</data>'
+        ] + RESPONSE_FOOTER)
+        
+        first = self.client.get_metar_data(["KORD", "KJFK"])
+        # Callers get their own copy, so editing one tree cannot corrupt later hits
+        first.find('data').clear()
+        second = self.client.get_metar_data(["kjfk", "KORD"])
+        
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(count_metars(second), 1)
+        
+        # A different data type is not served from the METAR entry
+        self.client.get_taf_data(["KORD", "KJFK"])
+        self.assertEqual(mock_request.call_count, 2)
+    
+    @patch('api_client.AviationWeatherAPIClient._make_single_request')
+    def test_empty_response_not_cached(self, mock_request):
+        """Test that a response without reports is fetched again on the next call."""
+        mock_request.return_value = b'<response><data num_results="0"/></response>'
+        
+        self.client.get_metar_data(["KORD"])
+        self.client.get_metar_data(["KORD"])
+        self.assertEqual(mock_request.call_count, 2)
+    
+    @patch('api_client.AviationWeatherAPIClient._make_single_request')
+    def test_cache_is_bounded(self, mock_request):
+        """Test that the cache never holds more than CACHE_MAX_ENTRIES requests."""
+        mock_request.return_value = b'\n'.join(RESPONSE_HEADER + [
+            b'<data num_results="1">',
+            b'<METAR><station_id>KORD</station_id></METAR>',
+            b'</data>'
+        ] + RESPONSE_FOOTER)
+        
+        for hours in range(self.client.CACHE_MAX_ENTRIES + 3):
+            self.client.get_metar_data(["KORD"], hours=hours)
+        self.assertEqual(len(self.client._cache), self.client.CACHE_MAX_ENTRIES)
+        
+        # The oldest entry was evicted, the newest is still served from the cache
+        calls = mock_request.call_count
+        self.client.get_metar_data(["KORD"], hours=self.client.CACHE_MAX_ENTRIES + 2)
+        self.assertEqual(mock_request.call_count, calls)
+        self.client.get_metar_data(["KORD"], hours=0)
+        self.assertEqual(mock_request.call_count, calls + 1)
+    
     def test_no_station_dropped_silently(self):
         """Test that no station is silently dropped during processing."""
         # Create test data with known stations
@@ -264,16 +449,16 @@ class TestIntegrationSmokeTest(unittest.TestCase):
         with patch('api_client.AviationWeatherAPIClient._make_single_request') as mock_request:
             # Mock successful response
             mock_xml = [
-                '<data num_results="5">',
-                '<METAR station_id="KORD"><observation_time>2025-01-06T12:00:00Z</observation_time></METAR>',
-                '<METAR station_id="KJFK"><observation_time>2025-01-06T12:00:00Z</observation_time></METAR>',
-                '<METAR station_id="KLAX"><observation_time>2025-01-06T12:00:00Z</observation_time></METAR>',
-                '<METAR station_id="KDFW"><observation_time>2025-01-06T12:00:00Z</observation_time></METAR>',
-                '<METAR station_id="KSEA"><observation_time>2025-01-06T12:00:00Z</observation_time></METAR>',
-                '</data>'
+                b'<data num_results="5">',
+                b'<METAR station_id="KORD"><observation_time>2025-01-06T12:00:00Z</observation_time></METAR>',
+                b'<METAR station_id="KJFK"><observation_time>2025-01-06T12:00:00Z</observation_time></METAR>',
+                b'<METAR station_id="KLAX"><observation_time>2025-01-06T12:00:00Z</observation_time></METAR>',
+                b'<METAR station_id="KDFW"><observation_time>2025-01-06T12:00:00Z</observation_time></METAR>',
+                b'<METAR station_id="KSEA"><observation_time>2025-01-06T12:00:00Z</observation_time></METAR>',
+                b'</data>'
             ]
-            mock_with_headers = ['h']*8 + mock_xml + ['t']
-            mock_request.return_value = '\n'.join(mock_with_headers).encode('utf-8')
+            mock_with_headers = RESPONSE_HEADER + mock_xml + RESPONSE_FOOTER
+            mock_request.return_value = b'\n'.join(mock_with_headers)
             
             result = self.client._make_chunked_request(
                 "https://test.com/api?ids=", 
@@ -282,13 +467,67 @@ class TestIntegrationSmokeTest(unittest.TestCase):
             )
         
         # All 5 stations should be present
-        metars = result.findall('.//METAR')
+        metars = result.findall('data/METAR')
         self.assertEqual(len(metars), 5)
         
         station_ids = [m.get('station_id') for m in metars]
         for station in test_stations:
             self.assertIn(station, station_ids)
 
+class TestResponseParsing(unittest.TestCase):
+    """Test parsing of single (non-chunked) API responses."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = AviationWeatherAPIClient()
+        fixture = os.path.join(os.path.dirname(__file__), 'test_fixtures', 'metar_actual_2025_sample.xml')
+        with open(fixture, 'rb') as f:
+            self.response_content = f.read()
+    
+    def test_parse_full_response(self):
+        """Test that a full API document is parsed into a data container."""
+        result = self.client._parse_response(self.response_content, "METAR")
+        
+        self.assertEqual(result.tag, 'response')
+        data_elem = result.find('data')
+        self.assertIsNotNone(data_elem)
+        
+        station_ids = [m.find('station_id').text for m in data_elem.findall('METAR')]
+        self.assertEqual(station_ids, ['KSRQ', 'KORD', 'KLAX', 'KDFW'])
+        self.assertEqual(count_metars(result), 4)
+    
+    def test_parse_invalid_response(self):
+        """Test that a non-XML response raises an API error."""
+        with self.assertRaises(AviationWeatherAPIError):
+            self.client._parse_response(b'not xml at all', "METAR")
+    
+    def test_parse_truncated_response(self):
+        """Test that a truncated response is an error rather than a partial result."""
+        truncated = self.response_content[:len(self.response_content) // 2]
+        with self.assertRaises(AviationWeatherAPIError):
+            self.client._parse_response(truncated, "METAR")
+    
+    def test_parse_html_error_page(self):
+        """Test that an HTML error page is an error rather than an empty result."""
+        html = b'<html><head><title>502 Bad Gateway</title></head><body><h1>Bad Gateway</h1></body></html>'
+        with self.assertRaises(AviationWeatherAPIError):
+            self.client._parse_response(html, "METAR")
+    
+    def test_parse_empty_response(self):
+        """Test that a zero-result response maps to the empty response."""
+        empty = (b'<?xml version="1.0" encoding="UTF-8"?>\n<response>\n'
+                 b'<data num_results="0"></data>\n</response>')
+        result = self.client._parse_response(empty, "METAR")
+        
+        self.assertEqual(result.find('data').get('num_results'), '0')
+        self.assertEqual(len(result.find('data')), 0)
+    
+    def test_iter_reports(self):
+        """Test that reports are streamed in document order."""
+        station_ids = [m.find('station_id').text
+                       for m in self.client.iter_reports("METAR", self.response_content)]
+        self.assertEqual(station_ids, ['KSRQ', 'KORD', 'KLAX', 'KDFW'])
+
 class TestDebugLogging(unittest.TestCase):
     """Test debug logging functionality."""
     
@@ -312,8 +551,8 @@ class TestDebugLogging(unittest.TestCase):
             )
         
         # Should have logged batch information
-        mock_logger.info.assert_any_call("Batching 400 stations into 2 batches of max 380")
-        mock_logger.info.assert_any_call("Final result: 0 unique stations after deduplication")
+        mock_logger.info.assert_any_call("Batching %d stations into %d batches of max %d", 400, 2, 380)
+        mock_logger.info.assert_any_call("Final result: %d unique stations after deduplication", 0)
 
 class TestConfiguration(unittest.TestCase):
     """Test configuration loading and constants."""
@@ -326,7 +565,7 @@ class TestConfiguration(unittest.TestCase):
         self.assertEqual(client.MAX_PER_REQUEST, 380)
         self.assertEqual(client.REQUEST_TIMEOUT, 15)
         self.assertEqual(client.RETRIES, 3)
-        self.assertEqual(client.INTER_BATCH_SLEEP, 0.2)
+        self.assertEqual(client.MAX_CONCURRENT_BATCHES, 4)
         
         # Test that timeout is set correctly
         self.assertEqual(client.timeout, 15)
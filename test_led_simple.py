@@ -6,6 +6,7 @@ Simple LED test script to verify LED strip is working
 import time
 import sys
 import os
+from array import array
 
 # Add current directory to path to import our modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -56,27 +57,23 @@ def test_led_strip():
     time.sleep(3)
     
     print("🔴 Testing all LEDs red...")
-    for i in range(strip.number):
-        strip.set_pixel_color(i, Color(255, 0, 0))
-    strip.show_pixels()
+    strip.buffer[:] = array('I', [Color(255, 0, 0)]) * strip.number
+    strip.flush()
     time.sleep(2)
     
     print("🟢 Testing all LEDs green...")
-    for i in range(strip.number):
-        strip.set_pixel_color(i, Color(0, 255, 0))
-    strip.show_pixels()
+    strip.buffer[:] = array('I', [Color(0, 255, 0)]) * strip.number
+    strip.flush()
     time.sleep(2)
     
     print("🔵 Testing all LEDs blue...")
-    for i in range(strip.number):
-        strip.set_pixel_color(i, Color(0, 0, 255))
-    strip.show_pixels()
+    strip.buffer[:] = array('I', [Color(0, 0, 255)]) * strip.number
+    strip.flush()
     time.sleep(2)
     
     print("⚫ Turning off all LEDs...")
-    for i in range(strip.number):
-        strip.set_pixel_color(i, Color(0, 0, 0))
-    strip.show_pixels()
+    strip.buffer[:] = array('I', [Color(0, 0, 0)]) * strip.number
+    strip.flush()
     
     print("✅ LED test completed successfully!")
     return True
@@ -2,12 +2,19 @@
 """
 Test suite for METAR parsing with 2025 AviationWeather.gov API compatibility.
 Tests flight category calculation, cloud parsing, visibility parsing, and error handling.
+
+The test classes are independent, so pytest can also spread them across
+processes with pytest-xdist: pytest -n auto test_metar_parsing.py
 """
 
 import unittest
+from unittest import mock
 import xml.etree.ElementTree as ET
+import math
 import os
+import random
 import sys
+from bisect import bisect_right
 from datetime import datetime
 
 # Add the current directory to the path so we can import the modules
@@ -16,160 +23,158 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 # Import the modules we're testing
 import config
 from log import logger
+from flight_category_calculator import CloudLayer, FlightCategoryCalculator, create_flight_category_calculator
+
+# lxml is optional; with it the cloud/visibility lookups run as compiled XPath
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+if etree is not None:
+    _CEILING_XPATH = etree.XPath(
+        "clouds/cloud[@sky_cover='OVC' or @sky_cover='BKN' or @sky_cover='OVX']"
+        " | sky_condition[@sky_cover='OVC' or @sky_cover='BKN' or @sky_cover='OVX']")
+    _VISIBILITY_XPATH = etree.XPath("visibility/statute_mi/text() | visibility_statute_mi/text()")
+
+# Sky covers that form a ceiling
+_CEILING_COVERS = frozenset(("OVC", "BKN", "OVX"))
+
+# Lower edges of the IFR, MVFR and VFR buckets; the VFR edges sit just above the
+# inclusive MVFR limits (3000 ft, 5 mi) so bisect_right keeps those values in MVFR
+_CEILING_BINS = (500, 1000, math.nextafter(3000, math.inf))
+_VISIBILITY_BINS = (1.0, 3.0, math.nextafter(5.0, math.inf))
+
+# Flight category by [ceiling bucket][visibility bucket]: the worse of the two wins
+_CATEGORY_TABLE = (
+    ("LIFR", "LIFR", "LIFR", "LIFR"),
+    ("LIFR", "IFR", "IFR", "IFR"),
+    ("LIFR", "IFR", "MVFR", "MVFR"),
+    ("LIFR", "IFR", "MVFR", "VFR"),
+)
+
+# Simulated API outcome by HTTP status code; anything else is UNKNOWN_ERROR
+_HTTP_STATUS_MAP = {
+    400: "INVALID_REQUEST",
+    204: "NO_DATA",
+    200: "SUCCESS",
+}
+
+def _load_fixture(path, tag, parser=ET):
+    """
+    Stream-parse a fixture file, indexing its reports by station in the same pass.
+    
+    Args:
+        path (str): Fixture file path
+        tag (str): Report element tag (METAR/TAF)
+        parser: ElementTree-compatible module used to parse (ET or lxml.etree)
+        
+    Returns:
+        tuple: (root element, dict mapping station_id to the first report for that station)
+    """
+    index = {}
+    if parser is ET:
+        context = ET.iterparse(path)
+        reports = (elem for _, elem in context if elem.tag == tag)
+    else:
+        # lxml filters on the tag in C
+        context = parser.iterparse(path, tag=tag)
+        reports = (elem for _, elem in context)
+    for elem in reports:
+        index.setdefault(elem.findtext('station_id'), elem)
+    return context.root, index
+
+class _MetarSummaryTarget:
+    """
+    Parser target that collects per-station METAR fields without building elements.
+    
+    close() returns {station_id: {'station_id', 'flight_category',
+    'visibility_statute_mi': text, 'sky': [(sky_cover, cloud_base_ft_agl), ...]}},
+    keeping the first report per station.
+    """
+    
+    _TEXT_FIELDS = frozenset(('station_id', 'flight_category', 'visibility_statute_mi'))
+    
+    def __init__(self):
+        self.summaries = {}
+        self._report = None
+        self._field = None
+        self._text = []
+    
+    def start(self, tag, attrib):
+        if tag == 'METAR':
+            self._report = {'sky': []}
+        elif self._report is not None:
+            if tag == 'sky_condition':
+                self._report['sky'].append((attrib.get('sky_cover'), attrib.get('cloud_base_ft_agl')))
+            elif tag in self._TEXT_FIELDS:
+                self._field = tag
+                self._text = []
+    
+    def data(self, data):
+        if self._field is not None:
+            self._text.append(data)
+    
+    def end(self, tag):
+        if tag == self._field:
+            self._report[tag] = ''.join(self._text).strip()
+            self._field = None
+        elif tag == 'METAR' and self._report is not None:
+            self.summaries.setdefault(self._report.get('station_id'), self._report)
+            self._report = None
+    
+    def close(self):
+        return self.summaries
+
+def _summarize_metars(path):
+    """Summarize a METAR fixture by station through _MetarSummaryTarget (lxml's C parser when available)."""
+    parser = (ET if etree is None else etree).XMLParser(target=_MetarSummaryTarget())
+    with open(path, 'rb') as f:
+        parser.feed(f.read())
+    return parser.close()
 
 class TestFlightCategoryCalculation(unittest.TestCase):
     """Test flight category calculation logic."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_metar_xml = os.path.join(os.path.dirname(__file__), 'test_fixtures', 'metar_2025_sample.xml')
-        self.test_taf_xml = os.path.join(os.path.dirname(__file__), 'test_fixtures', 'taf_2025_sample.xml')
+    @classmethod
+    def setUpClass(cls):
+        """Parse the test fixtures once for every test in the class."""
+        cls.test_metar_xml = os.path.join(os.path.dirname(__file__), 'test_fixtures', 'metar_2025_sample.xml')
+        cls.test_taf_xml = os.path.join(os.path.dirname(__file__), 'test_fixtures', 'taf_2025_sample.xml')
+        # lxml elements let _extract_ceiling_and_visibility use its compiled XPath path
+        cls._metar_root, cls._metars = _load_fixture(cls.test_metar_xml, 'METAR', ET if etree is None else etree)
     
     def test_vfr_calculation(self):
         """Test VFR calculation with high ceiling and good visibility."""
         # KORD: FEW250 (25000 ft ceiling), 10SM visibility
-        metar_data = self._parse_metar_xml()
-        kord_metar = None
-        for metar in metar_data.findall('METAR'):
-            if metar.find('station_id').text == 'KORD':
-                kord_metar = metar
-                break
+        kord_metar = self._metars.get('KORD')
         
         self.assertIsNotNone(kord_metar)
         
-        # Test cloud parsing - handle both nested and flat structures
-        sky_cvr = "SKC"
-        cld_base_ft_agl = 9999
-        
-        # Try nested structure first
-        clouds_elem = kord_metar.find('clouds')
-        if clouds_elem is not None:
-            for cloud_layer in clouds_elem.findall('cloud'):
-                sky_cvr = cloud_layer.get('sky_cover', 'SKC')
-                if sky_cvr in ("OVC", "BKN", "OVX"):
-                    cld_base_ft_agl = int(cloud_layer.get('cloud_base_ft_agl', '9999'))
-                    break
-        else:
-            # Try flat structure
-            for sky_cond in kord_metar.findall('sky_condition'):
-                sky_cvr = sky_cond.get('sky_cover', 'SKC')
-                if sky_cvr in ("OVC", "BKN", "OVX"):
-                    cld_base_ft_agl = int(sky_cond.get('cloud_base_ft_agl', '9999'))
-                    break
-        
-        # Test visibility parsing - handle both nested and flat structures
-        visibility_statute_mi = 999
-        vis_elem = kord_metar.find('visibility')
-        if vis_elem is not None:
-            statute_mi_elem = vis_elem.find('statute_mi')
-            if statute_mi_elem is not None:
-                visibility_statute_mi = float(statute_mi_elem.text)
-        else:
-            # Try flat structure
-            vis_elem = kord_metar.find('visibility_statute_mi')
-            if vis_elem is not None:
-                visibility_statute_mi = float(vis_elem.text)
-        
         # Calculate flight category
-        flightcategory = self._calculate_flight_category(sky_cvr, cld_base_ft_agl, visibility_statute_mi)
+        flightcategory = self._calculate_flight_category(*self._extract_ceiling_and_visibility(kord_metar))
         self.assertEqual(flightcategory, "VFR")
     
     def test_mvfr_calculation(self):
         """Test MVFR calculation with moderate ceiling and visibility."""
         # KJFK: BKN008 (800 ft ceiling), 3SM visibility
-        metar_data = self._parse_metar_xml()
-        kjfk_metar = None
-        for metar in metar_data.findall('METAR'):
-            if metar.find('station_id').text == 'KJFK':
-                kjfk_metar = metar
-                break
+        kjfk_metar = self._metars.get('KJFK')
         
         self.assertIsNotNone(kjfk_metar)
         
-        # Test cloud parsing - handle both nested and flat structures
-        sky_cvr = "SKC"
-        cld_base_ft_agl = 9999
-        
-        # Try nested structure first
-        clouds_elem = kjfk_metar.find('clouds')
-        if clouds_elem is not None:
-            for cloud_layer in clouds_elem.findall('cloud'):
-                sky_cvr = cloud_layer.get('sky_cover', 'SKC')
-                if sky_cvr in ("OVC", "BKN", "OVX"):
-                    cld_base_ft_agl = int(cloud_layer.get('cloud_base_ft_agl', '9999'))
-                    break
-        else:
-            # Try flat structure
-            for sky_cond in kjfk_metar.findall('sky_condition'):
-                sky_cvr = sky_cond.get('sky_cover', 'SKC')
-                if sky_cvr in ("OVC", "BKN", "OVX"):
-                    cld_base_ft_agl = int(sky_cond.get('cloud_base_ft_agl', '9999'))
-                    break
-        
-        # Test visibility parsing - handle both nested and flat structures
-        visibility_statute_mi = 999
-        vis_elem = kjfk_metar.find('visibility')
-        if vis_elem is not None:
-            statute_mi_elem = vis_elem.find('statute_mi')
-            if statute_mi_elem is not None:
-                visibility_statute_mi = float(statute_mi_elem.text)
-        else:
-            # Try flat structure
-            vis_elem = kjfk_metar.find('visibility_statute_mi')
-            if vis_elem is not None:
-                visibility_statute_mi = float(vis_elem.text)
-        
         # Calculate flight category
-        flightcategory = self._calculate_flight_category(sky_cvr, cld_base_ft_agl, visibility_statute_mi)
+        flightcategory = self._calculate_flight_category(*self._extract_ceiling_and_visibility(kjfk_metar))
         self.assertEqual(flightcategory, "MVFR")
     
     def test_lifr_calculation(self):
         """Test LIFR calculation with low ceiling and poor visibility."""
         # KLAX: OVC002 (200 ft ceiling), 0.5SM visibility
-        metar_data = self._parse_metar_xml()
-        klax_metar = None
-        for metar in metar_data.findall('METAR'):
-            if metar.find('station_id').text == 'KLAX':
-                klax_metar = metar
-                break
+        klax_metar = self._metars.get('KLAX')
         
         self.assertIsNotNone(klax_metar)
         
-        # Test cloud parsing - handle both nested and flat structures
-        sky_cvr = "SKC"
-        cld_base_ft_agl = 9999
-        
-        # Try nested structure first
-        clouds_elem = klax_metar.find('clouds')
-        if clouds_elem is not None:
-            for cloud_layer in clouds_elem.findall('cloud'):
-                sky_cvr = cloud_layer.get('sky_cover', 'SKC')
-                if sky_cvr in ("OVC", "BKN", "OVX"):
-                    cld_base_ft_agl = int(cloud_layer.get('cloud_base_ft_agl', '9999'))
-                    break
-        else:
-            # Try flat structure
-            for sky_cond in klax_metar.findall('sky_condition'):
-                sky_cvr = sky_cond.get('sky_cover', 'SKC')
-                if sky_cvr in ("OVC", "BKN", "OVX"):
-                    cld_base_ft_agl = int(sky_cond.get('cloud_base_ft_agl', '9999'))
-                    break
-        
-        # Test visibility parsing - handle both nested and flat structures
-        visibility_statute_mi = 999
-        vis_elem = klax_metar.find('visibility')
-        if vis_elem is not None:
-            statute_mi_elem = vis_elem.find('statute_mi')
-            if statute_mi_elem is not None:
-                visibility_statute_mi = float(statute_mi_elem.text)
-        else:
-            # Try flat structure
-            vis_elem = klax_metar.find('visibility_statute_mi')
-            if vis_elem is not None:
-                visibility_statute_mi = float(vis_elem.text)
-        
         # Calculate flight category
-        flightcategory = self._calculate_flight_category(sky_cvr, cld_base_ft_agl, visibility_statute_mi)
+        flightcategory = self._calculate_flight_category(*self._extract_ceiling_and_visibility(klax_metar))
         self.assertEqual(flightcategory, "LIFR")
     
     def test_missing_cloud_data(self):
@@ -190,59 +195,50 @@ class TestFlightCategoryCalculation(unittest.TestCase):
         self.assertEqual(self._calculate_flight_category("OVC", 3000, 5.0), "MVFR")  # 3000ft ceiling = MVFR, 5.0mi visibility = MVFR
         self.assertEqual(self._calculate_flight_category("OVC", 3001, 5.1), "VFR")  # 3001ft ceiling = VFR, 5.1mi visibility = VFR
     
-    def _parse_metar_xml(self):
-        """Parse the test METAR XML file."""
-        tree = ET.parse(self.test_metar_xml)
-        return tree.getroot()
+    def _extract_ceiling_and_visibility(self, metar):
+        """Read the first ceiling layer and the visibility from nested or flat METAR structures."""
+        if etree is not None and isinstance(metar, etree._Element):
+            layer = next(iter(_CEILING_XPATH(metar)), None)
+            visibility = _VISIBILITY_XPATH(metar)
+        else:
+            # Stop at the first ceiling layer instead of collecting them all
+            layer = next((layer for path in ('clouds/cloud', 'sky_condition') for layer in metar.iterfind(path)
+                          if layer.get('sky_cover') in _CEILING_COVERS), None)
+            visibility = [elem.text for elem in (metar.find('visibility/statute_mi'),
+                                                 metar.find('visibility_statute_mi')) if elem is not None]
+        
+        sky_cvr, cld_base_ft_agl = "SKC", 9999
+        if layer is not None:
+            sky_cvr = layer.get('sky_cover')
+            cld_base_ft_agl = int(layer.get('cloud_base_ft_agl', '9999'))
+        visibility_statute_mi = float(visibility[0]) if visibility else 999
+        return sky_cvr, cld_base_ft_agl, visibility_statute_mi
     
     def _calculate_flight_category(self, sky_cvr, cld_base_ft_agl, visibility_statute_mi):
         """Calculate flight category based on cloud and visibility data."""
-        flightcategory = "VFR"  # Initialize as VFR
-        
-        # Check cloud conditions first
-        if sky_cvr in ("OVC", "BKN", "OVX"):
-            if cld_base_ft_agl < 500:
-                flightcategory = "LIFR"
-            elif 500 <= cld_base_ft_agl < 1000:
-                flightcategory = "IFR"
-            elif 1000 <= cld_base_ft_agl <= 3000:
-                flightcategory = "MVFR"
-            elif cld_base_ft_agl > 3000:
-                flightcategory = "VFR"
-        
-        # Check visibility conditions (only if not already LIFR from clouds)
-        if flightcategory != "LIFR":
-            if visibility_statute_mi < 1.0:
-                flightcategory = "LIFR"
-            elif 1.0 <= visibility_statute_mi < 3.0:
-                flightcategory = "IFR"
-            elif 3.0 <= visibility_statute_mi <= 5.0 and flightcategory != "IFR":
-                flightcategory = "MVFR"
-        
-        return flightcategory
+        # Only ceiling covers limit the category; other layers count as unlimited
+        ceiling_bucket = bisect_right(_CEILING_BINS, cld_base_ft_agl) if sky_cvr in _CEILING_COVERS else 3
+        return _CATEGORY_TABLE[ceiling_bucket][bisect_right(_VISIBILITY_BINS, visibility_statute_mi)]
 
 class TestTAFParsing(unittest.TestCase):
     """Test TAF parsing with 2025 API format."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_taf_xml = os.path.join(os.path.dirname(__file__), 'test_fixtures', 'taf_2025_sample.xml')
+    @classmethod
+    def setUpClass(cls):
+        """Parse the TAF fixture once for every test in the class."""
+        cls.test_taf_xml = os.path.join(os.path.dirname(__file__), 'test_fixtures', 'taf_2025_sample.xml')
+        cls._taf_root, cls._tafs = _load_fixture(cls.test_taf_xml, 'TAF')
     
     def test_taf_parsing(self):
         """Test TAF XML parsing with new structure."""
-        tree = ET.parse(self.test_taf_xml)
-        root = tree.getroot()
+        root = self._taf_root
         
         # Test that we can find TAF elements
         tafs = root.findall('.//TAF')
         self.assertGreater(len(tafs), 0)
         
         # Test KORD TAF parsing
-        kord_taf = None
-        for taf in tafs:
-            if taf.find('station_id').text == 'KORD':
-                kord_taf = taf
-                break
+        kord_taf = self._tafs.get('KORD')
         
         self.assertIsNotNone(kord_taf)
         
@@ -315,21 +311,17 @@ class TestErrorHandling(unittest.TestCase):
 class Test2025APIParsing(unittest.TestCase):
     """Test parsing of actual 2025 API XML structure."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_metar_2025_xml = os.path.join(os.path.dirname(__file__), 'test_fixtures', 'metar_actual_2025_sample.xml')
+    @classmethod
+    def setUpClass(cls):
+        """Parse the 2025 API fixture once for every test in the class."""
+        cls.test_metar_2025_xml = os.path.join(os.path.dirname(__file__), 'test_fixtures', 'metar_actual_2025_sample.xml')
+        cls._metar_root, cls._metars = _load_fixture(cls.test_metar_2025_xml, 'METAR')
+        cls._summaries = _summarize_metars(cls.test_metar_2025_xml)
     
     def test_flat_sky_condition_parsing(self):
         """Test parsing of flat sky_condition elements from 2025 API."""
-        tree = ET.parse(self.test_metar_2025_xml)
-        root = tree.getroot()
-        
         # Test KSRQ (VFR with FEW250)
-        ksrq_metar = None
-        for metar in root.findall('METAR'):
-            if metar.find('station_id').text == 'KSRQ':
-                ksrq_metar = metar
-                break
+        ksrq_metar = self._metars.get('KSRQ')
         
         self.assertIsNotNone(ksrq_metar)
         
@@ -342,7 +334,7 @@ class Test2025APIParsing(unittest.TestCase):
         
         for sky_cond in sky_conditions:
             sky_cvr = sky_cond.get('sky_cover', 'SKC')
-            if sky_cvr in ("OVC", "BKN", "OVX"):
+            if sky_cvr in _CEILING_COVERS:
                 cld_base_ft_agl = int(sky_cond.get('cloud_base_ft_agl', '9999'))
                 break
         
@@ -352,15 +344,8 @@ class Test2025APIParsing(unittest.TestCase):
     
     def test_flat_visibility_parsing(self):
         """Test parsing of flat visibility_statute_mi elements from 2025 API."""
-        tree = ET.parse(self.test_metar_2025_xml)
-        root = tree.getroot()
-        
         # Test KSRQ visibility
-        ksrq_metar = None
-        for metar in root.findall('METAR'):
-            if metar.find('station_id').text == 'KSRQ':
-                ksrq_metar = metar
-                break
+        ksrq_metar = self._metars.get('KSRQ')
         
         self.assertIsNotNone(ksrq_metar)
         
@@ -374,37 +359,20 @@ class Test2025APIParsing(unittest.TestCase):
     
     def test_api_provided_flight_category(self):
         """Test parsing of API-provided flight_category elements."""
-        tree = ET.parse(self.test_metar_2025_xml)
-        root = tree.getroot()
-        
-        # Test all METARs have flight_category
-        for metar in root.findall('METAR'):
-            station_id = metar.find('station_id').text
-            flight_category_elem = metar.find('flight_category')
-            self.assertIsNotNone(flight_category_elem, f"No flight_category found for {station_id}")
-            self.assertIsNotNone(flight_category_elem.text, f"Empty flight_category for {station_id}")
-            
-            # Verify expected flight categories
-            if station_id == 'KSRQ':
-                self.assertEqual(flight_category_elem.text, 'VFR')
-            elif station_id == 'KORD':
-                self.assertEqual(flight_category_elem.text, 'IFR')
-            elif station_id == 'KLAX':
-                self.assertEqual(flight_category_elem.text, 'LIFR')
-            elif station_id == 'KDFW':
-                self.assertEqual(flight_category_elem.text, 'MVFR')
+        # Test all METARs have flight_category (only these fields are needed, so no elements are built)
+        actual = {station_id: summary.get('flight_category')
+                  for station_id, summary in self._summaries.items()}
+        self.assertDictEqual(actual, {'KSRQ': 'VFR', 'KORD': 'IFR', 'KLAX': 'LIFR', 'KDFW': 'MVFR'})
+        
+        # Sky conditions match what the element tree reports
+        self.assertEqual(self._summaries['KDFW']['sky'],
+                         [(sky.get('sky_cover'), sky.get('cloud_base_ft_agl'))
+                          for sky in self._metars['KDFW'].findall('sky_condition')])
     
     def test_multiple_sky_conditions(self):
         """Test parsing of multiple sky_condition elements."""
-        tree = ET.parse(self.test_metar_2025_xml)
-        root = tree.getroot()
-        
         # Test KDFW (has multiple sky conditions: SCT015, BKN025, OVC035)
-        kdfw_metar = None
-        for metar in root.findall('METAR'):
-            if metar.find('station_id').text == 'KDFW':
-                kdfw_metar = metar
-                break
+        kdfw_metar = self._metars.get('KDFW')
         
         self.assertIsNotNone(kdfw_metar)
         
@@ -417,7 +385,7 @@ class Test2025APIParsing(unittest.TestCase):
         
         for sky_cond in sky_conditions:
             sky_cvr = sky_cond.get('sky_cover', 'SKC')
-            if sky_cvr in ("OVC", "BKN", "OVX"):
+            if sky_cvr in _CEILING_COVERS:
                 cld_base_ft_agl = int(sky_cond.get('cloud_base_ft_agl', '9999'))
                 break
         
@@ -429,10 +397,8 @@ class TestVisibilityNormalization(unittest.TestCase):
     
     def test_normalize_visibility_value(self):
         """Test the normalize_visibility_value function."""
-        # Import the function from metar-v4.py
-        import sys
-        import os
-        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        # Import the function from metar-v4.py; kept local so that when the script
+        # cannot be imported (no metar_v4 module, no Pi GPIO) only this test errors
         from metar_v4 import normalize_visibility_value
         
         # Test regular numbers
@@ -463,23 +429,18 @@ class TestVisibilityNormalization(unittest.TestCase):
 class TestFlightCategoryCalculator(unittest.TestCase):
     """Test the enhanced FlightCategoryCalculator class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        from flight_category_calculator import FlightCategoryCalculator
-        self.calculator = FlightCategoryCalculator()
-        self.test_metar_2025_xml = os.path.join(os.path.dirname(__file__), 'test_fixtures', 'metar_actual_2025_sample.xml')
+    @classmethod
+    def setUpClass(cls):
+        """Parse the 2025 API fixture once for every test in the class."""
+        cls.test_metar_2025_xml = os.path.join(os.path.dirname(__file__), 'test_fixtures', 'metar_actual_2025_sample.xml')
+        cls._metar_root, cls._metars = _load_fixture(cls.test_metar_2025_xml, 'METAR')
+        # The calculator keeps no per-call state, so one instance serves every test
+        cls.calculator = FlightCategoryCalculator()
     
     def test_calculate_from_metar_element(self):
         """Test the enhanced calculate_from_metar_element method."""
-        tree = ET.parse(self.test_metar_2025_xml)
-        root = tree.getroot()
-        
         # Test KSRQ (VFR)
-        ksrq_metar = None
-        for metar in root.findall('METAR'):
-            if metar.find('station_id').text == 'KSRQ':
-                ksrq_metar = metar
-                break
+        ksrq_metar = self._metars.get('KSRQ')
         
         self.assertIsNotNone(ksrq_metar)
         
@@ -488,11 +449,7 @@ class TestFlightCategoryCalculator(unittest.TestCase):
         self.assertEqual(flight_category, "VFR")
         
         # Test KORD (IFR)
-        kord_metar = None
-        for metar in root.findall('METAR'):
-            if metar.find('station_id').text == 'KORD':
-                kord_metar = metar
-                break
+        kord_metar = self._metars.get('KORD')
         
         self.assertIsNotNone(kord_metar)
         flight_category = self.calculator.calculate_from_metar_element(kord_metar)
@@ -500,14 +457,7 @@ class TestFlightCategoryCalculator(unittest.TestCase):
     
     def test_parse_cloud_layers_flat_structure(self):
         """Test parsing cloud layers from flat sky_condition structure."""
-        tree = ET.parse(self.test_metar_2025_xml)
-        root = tree.getroot()
-        
-        kdfw_metar = None
-        for metar in root.findall('METAR'):
-            if metar.find('station_id').text == 'KDFW':
-                kdfw_metar = metar
-                break
+        kdfw_metar = self._metars.get('KDFW')
         
         self.assertIsNotNone(kdfw_metar)
         
@@ -521,14 +471,7 @@ class TestFlightCategoryCalculator(unittest.TestCase):
     
     def test_parse_visibility_flat_structure(self):
         """Test parsing visibility from flat visibility_statute_mi structure."""
-        tree = ET.parse(self.test_metar_2025_xml)
-        root = tree.getroot()
-        
-        ksrq_metar = None
-        for metar in root.findall('METAR'):
-            if metar.find('station_id').text == 'KSRQ':
-                ksrq_metar = metar
-                break
+        ksrq_metar = self._metars.get('KSRQ')
         
         self.assertIsNotNone(ksrq_metar)
         
@@ -537,6 +480,131 @@ class TestFlightCategoryCalculator(unittest.TestCase):
         visibility = self.calculator.parse_visibility(vis_elem)
         self.assertEqual(visibility, 10.0)
 
+    def test_lowest_ceiling_single_pass(self):
+        """Test that the fused ceiling scan matches parsing layers then scanning them."""
+        metar = ET.fromstring(
+            '<METAR><sky_condition sky_cover="FEW" cloud_base_ft_agl="800"/>'
+            '<sky_condition sky_cover="BKN" cloud_base_ft_agl="2500"/>'
+            '<sky_condition sky_cover="OVC" cloud_base_ft_agl="1200"/></METAR>')
+        samples = [
+            metar,
+            [{'sky_cover': 'OVC', 'cloud_base_ft_agl': '700'}, {'sky_cover': 'BKN', 'cloud_base_ft_agl': 'bad'}],
+            {'clouds': [{'sky_cover': 'OVX', 'cloud_base_ft_agl': '300'}]},
+            {'sky_condition': {'sky_cover': 'SCT', 'cloud_base_ft_agl': '400'}},
+            None,
+        ]
+        for clouds_data in samples:
+            expected = self.calculator.get_lowest_ceiling(self.calculator.parse_cloud_layers(clouds_data))
+            self.assertEqual(self.calculator._lowest_ceiling_from_raw(clouds_data), expected)
+        self.assertEqual(self.calculator._lowest_ceiling_from_raw(metar), 1200)
+        
+        # lxml elements go through the compiled XPath lookups with the same result
+        if etree is not None:
+            lxml_metar = etree.fromstring(ET.tostring(metar))
+            self.assertEqual(self.calculator.parse_cloud_layers(lxml_metar),
+                             self.calculator.parse_cloud_layers(metar))
+            self.assertEqual(self.calculator._lowest_ceiling_from_raw(lxml_metar), 1200)
+        
+        # The batch path reduces every station at once with the same result
+        self.assertEqual([int(c) for c in self.calculator.lowest_ceiling_batch(samples)],
+                         [self.calculator._lowest_ceiling_from_raw(c) for c in samples])
+
+    def test_lowest_ceiling_non_ascii_digits(self):
+        """Test that a non-ASCII digit base is skipped without losing the valid layers."""
+        layers = [{'sky_cover': 'OVC', 'cloud_base_ft_agl': '1500'},
+                  {'sky_cover': 'BKN', 'cloud_base_ft_agl': '²'}]
+
+        self.assertEqual(self.calculator.get_lowest_ceiling(layers[1:]), 9999)
+        self.assertEqual(self.calculator.get_lowest_ceiling(layers), 1500)
+        self.assertEqual(self.calculator._lowest_ceiling_from_raw(layers), 1500)
+        self.assertEqual([int(c) for c in self.calculator.lowest_ceiling_batch([layers])], [1500])
+
+    def test_unparseable_visibility_warns_every_time(self):
+        """Test that the visibility cache does not swallow repeated warnings."""
+        with mock.patch.object(logger, 'warning') as warning:
+            for _ in range(2):
+                self.assertEqual(self.calculator.normalize_visibility_value('M1/4X'), 999.0)
+        self.assertEqual(warning.call_count, 2)
+
+    def test_api_category_fast_path(self):
+        """Test that a known API-provided category is used and anything else is recalculated."""
+        def metar(category):
+            return ET.fromstring(
+                f'<METAR><flight_category>{category}</flight_category>'
+                '<visibility_statute_mi>0.5</visibility_statute_mi></METAR>')
+        
+        self.assertEqual(self.calculator.calculate_from_metar_element(metar(' MVFR ')), 'MVFR')
+        for category in ('NONE', '', 'BOGUS'):
+            self.assertEqual(self.calculator.calculate_from_metar_element(metar(category)), 'LIFR')
+        
+        if etree is not None:
+            self.assertEqual(self.calculator.calculate_from_metar_element(etree.fromstring(ET.tostring(metar('IFR')))), 'IFR')
+    
+    def test_calculate_from_metar_stream(self):
+        """Test streaming categories out of a METAR document."""
+        xml_bytes = (
+            b'<response><data num_results="2">'
+            b'<METAR><station_id>KAAA</station_id><flight_category>VFR</flight_category></METAR>'
+            b'<METAR><station_id>KBBB</station_id><visibility_statute_mi>1/2</visibility_statute_mi></METAR>'
+            b'</data></response>')
+        
+        results = list(self.calculator.calculate_from_metar_stream(xml_bytes))
+        self.assertEqual(results, [('KAAA', 'VFR'), ('KBBB', 'LIFR')])
+    
+    def test_parse_cloud_layers_types(self):
+        """Test that cloud layers come back as tuples, or as dicts on request."""
+        clouds = [{'sky_cover': 'BKN', 'cloud_base_ft_agl': '1500'}]
+        
+        layers = self.calculator.parse_cloud_layers(clouds)
+        self.assertEqual(layers, [CloudLayer('BKN', '1500')])
+        self.assertEqual(layers[0].cloud_base_ft_agl, '1500')
+        
+        dict_layers = self.calculator.parse_cloud_layers(clouds, as_dict=True)
+        self.assertEqual(dict_layers, clouds)
+        
+        # get_lowest_ceiling accepts either form
+        self.assertEqual(self.calculator.get_lowest_ceiling(layers), 1500)
+        self.assertEqual(self.calculator.get_lowest_ceiling(dict_layers), 1500)
+    
+    def test_determine_batch_matches_scalar_rules(self):
+        """Test that a large vectorized batch agrees with the scalar rules, sky covers included."""
+        rng = random.Random(42)
+        covers = ('OVC', 'BKN', 'OVX', 'SCT', 'FEW', 'SKC')
+        stations = [(rng.choice(covers), rng.choice((200, 499, 500, 999, 1000, 3000, 3001, 25000)),
+                     rng.choice((0.25, 1.0, 2.99, 3.0, 5.0, 5.1, 10.0)))
+                    for _ in range(10000)]
+        sky_covers, ceilings, visibilities = zip(*stations)
+        
+        expected = [self.calculator._determine_flight_category(ceiling if cover in _CEILING_COVERS else 99999,
+                                                               visibility)
+                    for cover, ceiling, visibility in stations]
+        batch = self.calculator.determine_flight_category_batch(ceilings, visibilities, sky_covers)
+        self.assertEqual([str(category) for category in batch], expected)
+    
+    def test_calculate_batch_matches_single(self):
+        """Test that batch calculation agrees with calculating each METAR on its own."""
+        root = self._metar_root
+        metars = list(root.iter('METAR'))
+        metars.append(ET.fromstring(
+            '<METAR><sky_condition sky_cover="OVC" cloud_base_ft_agl="700"/>'
+            '<visibility_statute_mi>10+</visibility_statute_mi></METAR>'))
+        metars.append(ET.fromstring('<METAR><flight_category>NONE</flight_category></METAR>'))
+        
+        expected = [self.calculator.calculate_from_metar_element(metar) for metar in metars]
+        self.assertEqual(self.calculator.calculate_batch(metars), expected)
+        self.assertEqual(expected[-2:], ['IFR', 'VFR'])
+    
+    def test_factory_returns_shared_calculator(self):
+        """Test that the factory hands out one shared calculator."""
+        self.assertIs(create_flight_category_calculator(), create_flight_category_calculator())
+    
+    def test_flight_category_color(self):
+        """Test color lookup for known and unknown flight categories."""
+        self.assertEqual(self.calculator.get_flight_category_color('VFR'),
+                         getattr(config, 'color_vfr', (0, 255, 0)))
+        self.assertEqual(self.calculator.get_flight_category_color('UNKNOWN'),
+                         self.calculator.get_flight_category_color('NONE'))
+
 class TestAPIIntegration(unittest.TestCase):
     """Test API integration and response handling."""
     
@@ -550,6 +618,9 @@ class TestAPIIntegration(unittest.TestCase):
         
         # Test 200 success
         self.assertEqual(self._handle_http_error(200), "SUCCESS")
+
+        # Unmapped codes fall through to the default
+        self.assertEqual(self._handle_http_error(503), "UNKNOWN_ERROR")
     
     def test_timeout_handling(self):
         """Test timeout handling."""
@@ -558,14 +629,7 @@ class TestAPIIntegration(unittest.TestCase):
     
     def _handle_http_error(self, status_code):
         """Simulate HTTP error handling."""
-        if status_code == 400:
-            return "INVALID_REQUEST"
-        elif status_code == 204:
-            return "NO_DATA"
-        elif status_code == 200:
-            return "SUCCESS"
-        else:
-            return "UNKNOWN_ERROR"
+        return _HTTP_STATUS_MAP.get(status_code, "UNKNOWN_ERROR")
 
 def run_tests():
     """Run all tests."""
@@ -573,13 +637,10 @@ def run_tests():
     test_suite = unittest.TestSuite()
     
     # Add test cases
-    test_suite.addTest(unittest.makeSuite(TestFlightCategoryCalculation))
-    test_suite.addTest(unittest.makeSuite(TestTAFParsing))
-    test_suite.addTest(unittest.makeSuite(TestErrorHandling))
-    test_suite.addTest(unittest.makeSuite(Test2025APIParsing))
-    test_suite.addTest(unittest.makeSuite(TestVisibilityNormalization))
-    test_suite.addTest(unittest.makeSuite(TestFlightCategoryCalculator))
-    test_suite.addTest(unittest.makeSuite(TestAPIIntegration))
+    loader = unittest.TestLoader()
+    for test_case in (TestFlightCategoryCalculation, TestTAFParsing, TestErrorHandling, Test2025APIParsing,
+                      TestVisibilityNormalization, TestFlightCategoryCalculator, TestAPIIntegration):
+        test_suite.addTest(loader.loadTestsFromTestCase(test_case))
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)
@@ -5,31 +5,124 @@ Test the actual metar-v4.py parsing logic with real API data.
 
 import sys
 import os
-import xml.etree.ElementTree as ET
-import urllib.request
+import hashlib
+import json
+import tempfile
+import time
+import types
+
+# lxml parses the response bytes with libxml2 when available; the stdlib parser has the same API
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+import config
+from api_client import AviationWeatherAPIClient, create_api_client
+
+# Parsing flags, read from config once
+_CFG = types.SimpleNamespace(
+    prefer_api_flight_category=getattr(config, 'prefer_api_flight_category', 1),
+    force_fallback_calculation=getattr(config, 'force_fallback_calculation', 0),
+    log_xml_parsing_details=getattr(config, 'log_xml_parsing_details', 1),
+)
+
+TEST_STATIONS = ('KSRQ', 'KORD', 'KLAX', 'KDFW')
+
+# Sky covers that form a ceiling
+CEILING_COVERS = frozenset(("OVC", "BKN", "OVX"))
+
+def _write_atomic(path, data):
+    """Write bytes to path through a temporary file, so readers never see a partial file."""
+    tmp_path = f"{path}.{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def fetch_cached(url, ttl=AviationWeatherAPIClient.METAR_CACHE_TTL):
+    """
+    Fetch a URL, reusing a copy cached on disk by earlier runs.
+    
+    A fresh copy is used without touching the network. A stale copy is
+    revalidated with If-None-Match/If-Modified-Since, and a 304 reply reuses
+    it without downloading the body again.
+    
+    Args:
+        url (str): Complete URL to request
+        ttl (float): Seconds a cached copy stays fresh
+        
+    Returns:
+        bytes: Response content
+        
+    Raises:
+        requests.HTTPError: If the server returns an error status
+    """
+    cache_base = os.path.join(tempfile.gettempdir(), f"metar_test_{hashlib.sha1(url.encode()).hexdigest()}")
+    cache_file = cache_base + '.xml'
+    validators_file = cache_base + '.json'
+    
+    try:
+        fresh = time.time() - os.path.getmtime(cache_file) < ttl
+        with open(cache_file, 'rb') as f:
+            cached = f.read()
+    except OSError:
+        cached = None
+    
+    headers = {}
+    if cached is not None:
+        if fresh:
+            print(f"Using cached response: {cache_file}")
+            return cached
+        # Revalidate only when there is a cached body to fall back on
+        try:
+            with open(validators_file) as f:
+                validators = json.load(f)
+        except (OSError, ValueError):
+            validators = {}
+        if 'ETag' in validators:
+            headers['If-None-Match'] = validators['ETag']
+        if 'Last-Modified' in validators:
+            headers['If-Modified-Since'] = validators['Last-Modified']
+    
+    # Reuse the API client's pooled session (keep-alive, gzip, retries)
+    client = create_api_client()
+    response = client._session.get(url, headers=headers, timeout=client.timeout)
+    if response.status_code == 304 and cached is not None:
+        print(f"Cached response still current: {cache_file}")
+        try:
+            os.utime(cache_file)
+        except OSError:
+            pass
+        return cached
+    response.raise_for_status()
+    
+    _write_atomic(cache_file, response.content)
+    _write_atomic(validators_file, json.dumps(
+        {name: response.headers[name] for name in ('ETag', 'Last-Modified') if name in response.headers}).encode())
+    return response.content
+
 def test_real_api_parsing():
     """Test parsing with real API data using the actual metar-v4.py logic."""
     try:
         print("Testing real API parsing with metar-v4.py logic...")
         
-        # Make real API call to get KSRQ data
-        api_url = "https://aviationweather.gov/api/data/metar?ids=ksrq&format=xml&hours=2.5"
+        # Fetch every test station in one batched API call
+        api_url = f"https://aviationweather.gov/api/data/metar?ids={','.join(TEST_STATIONS).lower()}&format=xml&hours=2.5"
         
         print(f"Fetching data from: {api_url}")
         
         try:
-            with urllib.request.urlopen(api_url, timeout=10) as response:
-                xml_data = response.read()
+            xml_data = fetch_cached(api_url)
         except Exception as e:
             print(f"✗ Failed to fetch API data: {e}")
             return False
         
         # Parse the XML
         root = ET.fromstring(xml_data)
+        print(f"✓ Got {len(root.findall('.//METAR'))} METARs for {len(TEST_STATIONS)} stations")
         
         # Find KSRQ METAR
         ksrq_metar = None
@@ -49,12 +142,7 @@ def test_real_api_parsing():
         print(f"Station ID: {stationId}")
         
         # Test configuration loading
-        import config
-        prefer_api_flight_category = getattr(config, 'prefer_api_flight_category', 1)
-        force_fallback_calculation = getattr(config, 'force_fallback_calculation', 0)
-        log_xml_parsing_details = getattr(config, 'log_xml_parsing_details', 1)
-        
-        print(f"Configuration: prefer_api_flight_category={prefer_api_flight_category}, force_fallback_calculation={force_fallback_calculation}")
+        print(f"Configuration: prefer_api_flight_category={_CFG.prefer_api_flight_category}, force_fallback_calculation={_CFG.force_fallback_calculation}")
         
         # Test API-provided flight category
         flight_category_elem = ksrq_metar.find('flight_category')
@@ -80,7 +168,7 @@ def test_real_api_parsing():
         for sky_cond in sky_conditions:
             sky_cvr = sky_cond.get('sky_cover', 'SKC')
             print(f"Sky Cover: {sky_cvr}")
-            if sky_cvr in ("OVC", "BKN", "OVX"):
+            if sky_cvr in CEILING_COVERS:
                 sky_condition = sky_cond
                 break
         
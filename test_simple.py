@@ -5,26 +5,77 @@ Simple test script to verify the 2025 API compatibility fixes.
 
 import sys
 import os
-import xml.etree.ElementTree as ET
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
-# Add current directory to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# lxml parses with libxml2 in C; the stdlib parser has the same API
+try:
+    from lxml import etree as ET
+    HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAVE_LXML = False
+
+if HAVE_LXML:
+    # Compiled once and evaluated in libxml2, about twice as fast as findtext() on lxml elements
+    station_id_of = ET.XPath('string(station_id)', smart_strings=False)
+else:
+    def station_id_of(metar):
+        return metar.findtext('station_id')
+
+# Add current directory to path (once, even if this module is imported again by a runner)
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
+
+from api_client import create_api_client
+from flight_category_calculator import FlightCategoryCalculator
+
+# One client for the module so repeated API calls reuse its pooled keep-alive session
+_CLIENT = create_api_client()
+
+# The calculator keeps no per-call state, so one instance serves every test
+_CALCULATOR = FlightCategoryCalculator()
+
+# Stations fetched together in one API request, the way metar-v4.py batches its airports
+STATION_IDS = ('KSRQ', 'KATL', 'KORD', 'KJFK')
+API_URL = f"https://aviationweather.gov/api/data/metar?ids={','.join(STATION_IDS).lower()}&format=xml&hours=2.5"
+
+def find_metars(source, station_ids):
+    """Stream-parse a METAR response and return {station_id: first report} for the given stations."""
+    wanted = set(station_ids)
+    found = {}
+    if HAVE_LXML:
+        context = ET.iterparse(source, events=('end',), tag='METAR')
+    else:
+        context = ((event, elem) for event, elem in ET.iterparse(source, events=('end',))
+                   if elem.tag == 'METAR')
+    # Read to the end so the pooled connection can be reused
+    for _, metar in context:
+        station_id = station_id_of(metar)
+        if station_id in wanted and station_id not in found:
+            found[station_id] = metar
+            continue
+        # Drop other reports as soon as they are parsed
+        metar.clear()
+        if HAVE_LXML:
+            metar.getparent().remove(metar)
+    return found
+
+def fetch_metars():
+    """Fetch the test stations in one request, parsing the XML as it arrives rather than buffering it."""
+    with _CLIENT._session.get(API_URL, timeout=_CLIENT.timeout, stream=True) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        return find_metars(response.raw, STATION_IDS)
 
 def test_normalize_visibility():
     """Test the normalize_visibility_value function."""
     try:
-        # Import the function from metar-v4.py
-        import sys
-        import os
-        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-        
-        # Try to import the function
-        try:
-            from metar_v4 import normalize_visibility_value
-        except ImportError:
-            # If direct import fails, try importing the module first
-            import metar_v4
-            normalize_visibility_value = metar_v4.normalize_visibility_value
+        # Import the function from metar-v4.py; kept local so that when the script
+        # cannot be imported (no metar_v4 module, no Pi GPIO) only this test fails
+        from metar_v4 import normalize_visibility_value
         
         print("Testing visibility normalization...")
         
@@ -63,11 +114,9 @@ def test_normalize_visibility():
 def test_flight_category_calculator():
     """Test the FlightCategoryCalculator class."""
     try:
-        from flight_category_calculator import FlightCategoryCalculator
-        
         print("Testing FlightCategoryCalculator...")
         
-        calculator = FlightCategoryCalculator()
+        calculator = _CALCULATOR
         
         # Test visibility normalization
         assert calculator.normalize_visibility_value("10+") == 10.0
@@ -80,6 +129,14 @@ def test_flight_category_calculator():
         assert calculator._determine_flight_category(800, 2.0) == "IFR"
         assert calculator._determine_flight_category(200, 0.5) == "LIFR"
         
+        # Test batch calculation matches the scalar rules
+        ceilings = [25000, 1000, 800, 200, 9999, 500, 3000, 3001]
+        visibilities = [10.0, 3.0, 2.0, 0.5, 1.0, 1.0, 5.0, 5.1]
+        batch = calculator.determine_flight_category_batch(ceilings, visibilities)
+        assert list(batch) == [calculator._determine_flight_category(c, v)
+                               for c, v in zip(ceilings, visibilities)]
+        assert list(batch[:4]) == ['VFR', 'MVFR', 'IFR', 'LIFR']
+        
         print("✓ FlightCategoryCalculator tests passed!")
         return True
         
@@ -87,60 +144,58 @@ def test_flight_category_calculator():
         print(f"✗ FlightCategoryCalculator test failed: {e}")
         return False
 
-def test_xml_parsing():
-    """Test XML parsing with real API call."""
+def test_xml_parsing(pending=None):
+    """Test XML parsing with real API call (pending: a Future of fetch_metars() already under way)."""
     try:
         print("Testing XML parsing with real API call...")
         
-        import urllib.request
-        import urllib.parse
-        
-        # Make real API call to get KSRQ data
-        api_url = "https://aviationweather.gov/api/data/metar?ids=ksrq&format=xml&hours=2.5"
-        
-        print(f"Fetching data from: {api_url}")
+        # Make one real API call for every test station
+        print(f"Fetching data from: {API_URL}")
         
         try:
-            with urllib.request.urlopen(api_url, timeout=10) as response:
-                xml_data = response.read()
+            metars = fetch_metars() if pending is None else pending.result()
         except Exception as e:
             print(f"✗ Failed to fetch API data: {e}")
             return False
         
-        # Parse the XML
-        root = ET.fromstring(xml_data)
-        
-        # Test KSRQ parsing
-        ksrq_metar = None
-        for metar in root.findall('METAR'):
-            if metar.find('station_id').text == 'KSRQ':
-                ksrq_metar = metar
-                break
+        missing = [station_id for station_id in STATION_IDS if station_id not in metars]
+        if missing:
+            print(f"✗ No METAR returned for: {', '.join(missing)}")
+            return False
+        print(f"✓ Got METARs for {len(metars)} stations in one request")
         
+        ksrq_metar = metars['KSRQ']
         if ksrq_metar is not None:
             print("✓ Found KSRQ METAR data")
             
+            # Collect the flat 2025 fields in one walk over the report's children
+            sky_conditions = []
+            vis_elem = flight_category_elem = None
+            for child in ksrq_metar:
+                if child.tag == 'sky_condition':
+                    sky_conditions.append(child)
+                elif child.tag == 'visibility_statute_mi' and vis_elem is None:
+                    vis_elem = child
+                elif child.tag == 'flight_category' and flight_category_elem is None:
+                    flight_category_elem = child
+            
             # Test flat sky_condition parsing
-            sky_conditions = ksrq_metar.findall('sky_condition')
             print(f"Found {len(sky_conditions)} sky_condition elements")
             
             # Test flat visibility parsing
-            vis_elem = ksrq_metar.find('visibility_statute_mi')
             if vis_elem is not None:
                 print(f"Visibility: {vis_elem.text} miles")
             else:
                 print("No visibility_statute_mi element found")
             
             # Test API-provided flight category
-            flight_category_elem = ksrq_metar.find('flight_category')
             if flight_category_elem is not None:
                 print(f"API Flight Category: {flight_category_elem.text}")
             else:
                 print("No flight_category element found")
             
             # Test the enhanced parsing logic
-            from flight_category_calculator import FlightCategoryCalculator
-            calculator = FlightCategoryCalculator()
+            calculator = _CALCULATOR
             
             # Test parsing cloud layers
             cloud_layers = calculator.parse_cloud_layers(ksrq_metar)
@@ -164,7 +219,6 @@ def test_xml_parsing():
         
     except Exception as e:
         print(f"✗ XML parsing test failed: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -173,19 +227,22 @@ def main():
     print("Running simple compatibility tests...")
     print("=" * 50)
     
-    tests = [
-        test_normalize_visibility,
-        test_flight_category_calculator,
-        test_xml_parsing
-    ]
-    
     passed = 0
-    total = len(tests)
     
-    for test in tests:
-        if test():
-            passed += 1
-        print()
+    # Start the network fetch first so it overlaps the local tests; the tests
+    # themselves still run in order so their output stays readable
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        tests = [
+            test_normalize_visibility,
+            test_flight_category_calculator,
+            partial(test_xml_parsing, executor.submit(fetch_metars))
+        ]
+        total = len(tests)
+        
+        for test in tests:
+            if test():
+                passed += 1
+            print()
     
     print("=" * 50)
     print(f"Tests passed: {passed}/{total}")